@@ -0,0 +1,128 @@
+"""Frame-clock animation of robots walking their paths.
+
+Progress is measured in path steps and follows the real clock: at
+``speed`` steps per second, a frame drawn t seconds after the start shows
+every robot ``t * speed`` steps along its path, between cells when the
+step count is fractional. A slow frame therefore never slows the robots
+down, and at high speeds several steps simply pass within one frame; the
+frame callback gets them all at once. Very long paths are sped up so the
+walk never takes more than LONG_PATH_SECONDS.
+
+Each frame costs one callback no matter how large the grid is; the
+callback only moves sprite items and repaints the cells passed since the
+last frame.
+"""
+import time
+
+FRAME_MS = 16  # about 60 frames per second
+DEFAULT_SPEED = 10  # steps per second
+LONG_PATH_SECONDS = 20
+
+
+def interpolate(path, step):
+    """(row, col) of a robot ``step`` steps along ``path``, as floats"""
+    last = len(path) - 1
+    if step >= last:
+        return path[last]
+    index = int(step)
+    fraction = step - index
+    (r1, c1), (r2, c2) = path[index], path[index + 1]
+    return r1 + (r2 - r1) * fraction, c1 + (c2 - c1) * fraction
+
+
+class PathAnimation:
+    """Drives ``on_frame(step)`` for timed paths until the longest one ends.
+
+    ``widget`` is any Tk widget (used for ``after``). ``on_frame`` receives
+    the current step as a float; ``on_done`` runs once when the last path
+    ends or the animation is skipped to its end.
+    """
+
+    def __init__(self, widget, paths, on_frame, on_done, speed=DEFAULT_SPEED):
+        self.widget = widget
+        self.on_frame = on_frame
+        self.on_done = on_done
+        self.last_step = max(len(path) for path in paths if path) - 1
+        self.min_speed = self.last_step / LONG_PATH_SECONDS
+        self.step = 0.0
+        self.speed = max(speed, self.min_speed)
+        self.paused = False
+        self.finished = False
+        self._after_id = None
+
+    def start(self):
+        self._anchor()
+        self._tick()
+        return self
+
+    def _anchor(self):
+        # Progress is measured from here: step = anchor_step + elapsed * speed
+        self.anchor_time = time.perf_counter()
+        self.anchor_step = self.step
+
+    def _tick(self):
+        self._after_id = None
+        began = time.perf_counter()
+        self.step = min(self.anchor_step + (began - self.anchor_time) * self.speed, self.last_step)
+        self.on_frame(self.step)
+        if self.step >= self.last_step:
+            self._finish()
+            return
+        # Aim for a steady frame rate by subtracting this frame's own cost
+        spent_ms = (time.perf_counter() - began) * 1000
+        self._after_id = self.widget.after(max(1, int(FRAME_MS - spent_ms)), self._tick)
+
+    def _finish(self):
+        self.finished = True
+        self.on_done()
+
+    def set_speed(self, speed):
+        """Change speed (steps per second) without a jump in position"""
+        self.step = self._current_step()
+        self.speed = max(speed, self.min_speed)
+        self._anchor()
+
+    def _current_step(self):
+        if self.paused or self.finished:
+            return self.step
+        return min(self.anchor_step + (time.perf_counter() - self.anchor_time) * self.speed, self.last_step)
+
+    def pause(self):
+        if self.paused or self.finished:
+            return
+        self.step = self._current_step()
+        self.paused = True
+        self._cancel_frame()
+
+    def resume(self):
+        if not self.paused or self.finished:
+            return
+        self.paused = False
+        self._anchor()
+        self._tick()
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def skip(self):
+        """Jump to the end: draw the final frame and finish now"""
+        if self.finished:
+            return
+        self._cancel_frame()
+        self.paused = False
+        self.step = self.last_step
+        self.on_frame(self.step)
+        self._finish()
+
+    def stop(self):
+        """Stop without finishing (on_done is not called)"""
+        self._cancel_frame()
+        self.finished = True
+
+    def _cancel_frame(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
@@ -0,0 +1,117 @@
+"""On-disk cache for the game's sprites.
+
+Files are named after a hash of their URL and a manifest records the
+SHA-256 of each download, so a truncated or corrupted file is never used.
+Sprites shipped in the ``assets`` folder next to this module are checked
+first; downloads go to the user cache directory. Nothing here touches the
+network unless ``fetch`` or ``refresh`` is called.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+
+BUNDLED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "robo-path")
+
+# Cached sprites older than this are re-downloaded by refresh()
+MAX_AGE_S = 7 * 24 * 3600
+FETCH_TIMEOUT_S = 10
+
+
+def url_key(url):
+    return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+
+class AssetCache:
+    """Sprite files keyed by URL and verified by content hash"""
+
+    def __init__(self, cache_dir=CACHE_DIR, bundled_dir=BUNDLED_DIR):
+        self.cache_dir = cache_dir
+        self.bundled_dir = bundled_dir
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        self.lock = threading.Lock()
+        try:
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def path(self, url):
+        """Local file for ``url``, or None if it hasn't been downloaded"""
+        bundled = os.path.join(self.bundled_dir, url_key(url) + ".png")
+        if os.path.exists(bundled):
+            return bundled
+        entry = self.manifest.get(url)
+        if entry is None:
+            return None
+        local = os.path.join(self.cache_dir, entry["file"])
+        try:
+            with open(local, "rb") as f:
+                if hashlib.sha256(f.read()).hexdigest() != entry["sha256"]:
+                    return None
+        except OSError:
+            return None
+        return local
+
+    def resized_path(self, url, size):
+        """Local file for ``url`` scaled to size x size, made once from the original.
+
+        Needs Pillow; returns None if the original isn't available.
+        """
+        original = self.path(url)
+        if original is None:
+            return None
+        resized = os.path.join(self.cache_dir, f"{url_key(url)}_{size}.png")
+        if os.path.exists(resized) and os.path.getmtime(resized) >= os.path.getmtime(original):
+            return resized
+        from PIL import Image
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with Image.open(original) as image:
+            image.resize((size, size), Image.Resampling.LANCZOS).save(resized + ".tmp", "PNG")
+        os.replace(resized + ".tmp", resized)
+        return resized
+
+    def fetch(self, url):
+        """Download ``url`` into the cache and return True if the content changed"""
+        with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT_S) as response:
+            data = response.read()
+        digest = hashlib.sha256(data).hexdigest()
+        name = url_key(url) + ".png"
+        with self.lock:
+            old = self.manifest.get(url)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            local = os.path.join(self.cache_dir, name)
+            # Write then rename so a reader never sees half a file
+            with open(local + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(local + ".tmp", local)
+            self.manifest[url] = {"file": name, "sha256": digest, "fetched": time.time()}
+            with open(self.manifest_path + ".tmp", "w") as f:
+                json.dump(self.manifest, f, indent=1)
+            os.replace(self.manifest_path + ".tmp", self.manifest_path)
+        return old is None or old["sha256"] != digest
+
+    def is_stale(self, url):
+        if self.path(url) is None:
+            return True
+        entry = self.manifest.get(url)
+        return entry is not None and time.time() - entry["fetched"] > MAX_AGE_S
+
+    def refresh(self, urls):
+        """Fetch missing or stale sprites; return the URLs whose content changed.
+
+        Network errors are skipped so an offline refresh just keeps what's cached.
+        """
+        changed = []
+        for url in urls:
+            if not self.is_stale(url):
+                continue
+            try:
+                if self.fetch(url):
+                    changed.append(url)
+            except OSError as e:
+                print(f"Could not refresh {url}: {e}")
+        return changed
@@ -0,0 +1,83 @@
+"""Answer many start/goal queries against one grid on a process pool.
+
+The grid is copied once into a shared-memory block that every worker maps
+at startup, so tasks only carry (start, goal) pairs and results, never
+the map itself.
+"""
+import multiprocessing
+import os
+
+import distance_field  # noqa: F401 - registers "Distance Field" for workers too
+import dstar_lite  # noqa: F401 - registers "D* Lite" for workers too
+import flat_search  # noqa: F401 - registers the flat-array searches for workers too
+import hpa  # noqa: F401 - registers "HPA*" for workers too
+from connectivity import index_for, unreachable_result
+from pathfinding_engine import Grid, search
+
+# Below this many queries the pool start-up costs more than it saves
+MIN_PARALLEL_QUERIES = 64
+
+_worker_grid = None
+_worker_algorithm = None
+
+
+def _init_worker(cells, rows, cols, algorithm, costs=None):
+    global _worker_grid, _worker_algorithm
+    _worker_grid = Grid(rows, cols, cells)
+    if costs is not None:
+        _worker_grid.costs = memoryview(costs).cast("B")
+    _worker_algorithm = algorithm
+
+
+def _run_query(query):
+    start, goal = query
+    return search(_worker_grid, start, goal, _worker_algorithm, record_order=False)
+
+
+def batch_search(grid, queries, algorithm="A*", processes=None, chunksize=None):
+    """Run ``algorithm`` for every (start, goal) pair in ``queries``.
+
+    Returns a list of (path, stats) tuples in the same order as the queries;
+    stats carry counts only, not the expansion order.
+    ``processes`` defaults to the number of CPUs; with one process, or a
+    small batch, the queries run in the calling process instead.
+    Queries whose start and goal lie in different regions are answered
+    from the connectivity index and never reach a worker.
+    """
+    queries = list(queries)
+    index = index_for(grid)
+    results = [None] * len(queries)
+    pending = []
+    for i, (start, goal) in enumerate(queries):
+        for state in (start, goal):
+            if not grid.in_bounds(state):
+                raise ValueError(f"Cell {state} is outside the grid")
+        if index.connected(start, goal):
+            pending.append(i)
+        else:
+            results[i] = unreachable_result(algorithm, start, goal)
+    for i, result in zip(pending, _search_all(grid, [queries[i] for i in pending],
+                                              algorithm, processes, chunksize)):
+        results[i] = result
+    return results
+
+
+def _search_all(grid, queries, algorithm, processes, chunksize):
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(queries))
+    if processes <= 1 or len(queries) < MIN_PARALLEL_QUERIES:
+        return [search(grid, start, goal, algorithm, record_order=False) for start, goal in queries]
+
+    # RawArray lives in shared memory and reaches workers only at start-up
+    cells = multiprocessing.RawArray("B", grid.rows * grid.cols)
+    memoryview(cells).cast("B")[:] = grid.cells
+    costs = None
+    if grid.costs is not None:
+        costs = multiprocessing.RawArray("B", grid.rows * grid.cols)
+        memoryview(costs).cast("B")[:] = grid.costs
+    if chunksize is None:
+        chunksize = max(1, len(queries) // (processes * 4))
+    with multiprocessing.Pool(processes, _init_worker,
+                              (cells, grid.rows, grid.cols, algorithm, costs)) as pool:
+        return pool.map(_run_query, queries, chunksize)
@@ -0,0 +1,215 @@
+"""Reproducible benchmark of the pathfinding algorithms.
+
+Generates seeded random mazes for every (size, difficulty) pair, runs each
+algorithm corner to corner and writes one JSON object per run, so results
+from different versions can be diffed or loaded into a dataframe.
+
+    python benchmark.py --sizes 20 100 500 2000 --output bench.jsonl
+
+With ``--scen`` it runs a Moving AI scenario file instead, on the map the
+scenarios name (looked up next to the .scen file unless ``--map`` is given).
+
+With ``--repeated N`` it answers N random queries per maze with each
+flat-array search and the dict-based version it mirrors, and reports the
+per-query time and peak memory of both.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import dstar_lite  # noqa: F401 - registers "D* Lite"
+import distance_field  # noqa: F401 - registers "Distance Field"
+import hpa  # noqa: F401 - registers "HPA*"
+from connectivity import index_for
+from flat_search import DICT_VERSIONS, buffers_for
+from map_io import load_any, load_movingai_scen
+from pathfinding_engine import (DIFFICULTY_DENSITY, MAX_COST, MIN_COST, WEIGHTED_ALGORITHMS, Grid, algorithm_names,
+                                fill_random_costs, fill_random_walls, search)
+
+DEFAULT_SIZES = [20, 100, 500, 2000]
+
+
+def make_maze(size, difficulty, seed, max_cost=1):
+    """Seeded size x size maze with the two corners kept open.
+
+    With ``max_cost`` above 1 every cell also gets a random terrain cost.
+    """
+    grid = Grid(size, size)
+    corners = [(0, 0), (size - 1, size - 1)]
+    fill_random_walls(grid, DIFFICULTY_DENSITY[difficulty], seed, keep_free=corners)
+    if max_cost > 1:
+        fill_random_costs(grid, max_cost, seed)
+    return grid, corners
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_case(grid, start, goal, algorithm, repeat=3):
+    """Time ``repeat`` runs (best wall time) and measure peak memory in one more.
+
+    Every run gets its own copy of the grid so planners that keep state
+    between queries (D* Lite, distance fields) always start cold.
+    """
+    best = None
+    for _ in range(repeat):
+        copy = grid.copy()
+        began = time.perf_counter()
+        path, stats = search(copy, start, goal, algorithm, record_order=False)
+        elapsed = time.perf_counter() - began
+        best = elapsed if best is None else min(best, elapsed)
+
+    copy = grid.copy()
+    tracemalloc.start()
+    search(copy, start, goal, algorithm, record_order=False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "algorithm": algorithm,
+        "weighted": algorithm in WEIGHTED_ALGORITHMS,
+        "wall_time_s": round(best, 6),
+        "peak_memory_bytes": peak,
+        "pushes": stats.pushes,
+        "nodes_expanded": stats.nodes_expanded,
+        "peak_frontier": stats.peak_frontier,
+        "path_length": len(path) if path else None,
+        "path_cost": stats.path_cost,
+    }
+
+
+def run_benchmark(sizes, difficulties, algorithms, seed=0, repeat=3, out=sys.stdout, max_cost=1):
+    meta = {"commit": _git_commit(), "python": platform.python_version(), "seed": seed, "max_cost": max_cost}
+    for size in sizes:
+        for difficulty in difficulties:
+            grid, (start, goal) = make_maze(size, difficulty, seed, max_cost)
+            for algorithm in algorithms:
+                record = {"size": size, "difficulty": difficulty,
+                          "wall_density": DIFFICULTY_DENSITY[difficulty], **meta}
+                record.update(run_case(grid, start, goal, algorithm, repeat))
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+
+def run_scenarios(scen_path, algorithms, repeat=3, out=sys.stdout, map_path=None):
+    """Run every scenario of a Moving AI .scen file through each algorithm"""
+    meta = {"commit": _git_commit(), "python": platform.python_version(), "scen": os.path.basename(scen_path)}
+    grids = {}
+    for scenario in load_movingai_scen(scen_path):
+        path = map_path or os.path.join(os.path.dirname(scen_path), os.path.basename(scenario["map"]))
+        if path not in grids:
+            grids[path] = load_any(path)
+        for algorithm in algorithms:
+            record = {"map": scenario["map"], "bucket": scenario["bucket"],
+                      "optimal_octile_length": scenario["optimal_length"], **meta}
+            record.update(run_case(grids[path], scenario["start"], scenario["goal"], algorithm, repeat))
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+
+
+def random_queries(grid, count, seed):
+    """``count`` seeded start/goal pairs, each inside one connected region"""
+    rng = random.Random(seed)
+    labels = index_for(grid).labels
+    free = [i for i, label in enumerate(labels) if label >= 0]
+    queries = []
+    while free and len(queries) < count:
+        start, goal = rng.choice(free), rng.choice(free)
+        if labels[start] == labels[goal]:
+            queries.append((divmod(start, grid.cols), divmod(goal, grid.cols)))
+    return queries
+
+
+def _per_query(grid, queries, algorithm):
+    """(mean seconds, largest peak bytes) over ``queries``, after one warm-up query"""
+    search(grid, *queries[0], algorithm, record_order=False)
+    began = time.perf_counter()
+    for start, goal in queries:
+        search(grid, start, goal, algorithm, record_order=False)
+    elapsed = (time.perf_counter() - began) / len(queries)
+    peak = 0
+    for start, goal in queries:
+        tracemalloc.start()
+        search(grid, start, goal, algorithm, record_order=False)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def run_repeated(sizes, difficulties, count, seed=0, out=sys.stdout, max_cost=1):
+    """Compare each flat-array search with its dict-based version on repeated queries.
+
+    Both run the same ``count`` queries on one grid, so the flat buffers are
+    reused the way a long-lived planner would reuse them.
+    """
+    meta = {"commit": _git_commit(), "python": platform.python_version(), "seed": seed, "max_cost": max_cost}
+    for size in sizes:
+        for difficulty in difficulties:
+            grid, _ = make_maze(size, difficulty, seed, max_cost)
+            queries = random_queries(grid, count, seed)
+            if not queries:
+                continue
+            for flat, baseline in DICT_VERSIONS.items():
+                flat_time, flat_peak = _per_query(grid, queries, flat)
+                base_time, base_peak = _per_query(grid, queries, baseline)
+                record = {"size": size, "difficulty": difficulty, "queries": len(queries),
+                          "algorithm": flat, "baseline": baseline, **meta,
+                          "per_query_s": round(flat_time, 6), "baseline_per_query_s": round(base_time, 6),
+                          "speedup": round(base_time / flat_time, 2),
+                          "peak_memory_bytes": flat_peak, "baseline_peak_memory_bytes": base_peak,
+                          "buffer_bytes": buffers_for(grid).nbytes}
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--difficulties", nargs="+", default=list(DIFFICULTY_DENSITY),
+                        choices=list(DIFFICULTY_DENSITY))
+    parser.add_argument("--algorithms", nargs="+", default=algorithm_names(), choices=algorithm_names())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is reported)")
+    parser.add_argument("--max-cost", type=int, default=1, choices=range(MIN_COST, MAX_COST + 1),
+                        help="random terrain costs from 1 to this (1 = unweighted)")
+    parser.add_argument("--output", help="JSONL file to append to (default: stdout)")
+    parser.add_argument("--scen", help="Moving AI .scen file to run instead of generated mazes")
+    parser.add_argument("--map", help="map for --scen (a Moving AI .map or a binary map file)")
+    parser.add_argument("--repeated", type=int, metavar="N",
+                        help="compare flat-array and dict-based searches over N random queries per size")
+    args = parser.parse_args(argv)
+
+    if args.repeated:
+        if args.output:
+            with open(args.output, "a") as out:
+                run_repeated(args.sizes, args.difficulties, args.repeated, args.seed, out, args.max_cost)
+        else:
+            run_repeated(args.sizes, args.difficulties, args.repeated, args.seed, max_cost=args.max_cost)
+    elif args.scen:
+        if args.output:
+            with open(args.output, "a") as out:
+                run_scenarios(args.scen, args.algorithms, args.repeat, out, args.map)
+        else:
+            run_scenarios(args.scen, args.algorithms, args.repeat, map_path=args.map)
+    elif args.output:
+        with open(args.output, "a") as out:
+            run_benchmark(args.sizes, args.difficulties, args.algorithms, args.seed, args.repeat, out,
+                          args.max_cost)
+    else:
+        run_benchmark(args.sizes, args.difficulties, args.algorithms, args.seed, args.repeat,
+                      max_cost=args.max_cost)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Raster board view: the grid drawn as image tiles on a Tk canvas.
+
+The board is painted with NumPy into PIL images instead of one canvas
+rectangle per cell, so a frame costs the same on a 20x20 board and on a
+4000x4000 map. Only the tiles inside the visible part of the canvas exist;
+panning creates the ones that scroll into view and drops the ones that
+leave it, and an edit repaints just the tiles holding the changed cells.
+The path, robots and flags stay ordinary canvas items drawn on top.
+
+Zoom levels below one pixel per cell sample every n-th cell.
+"""
+import numpy as np
+from PIL import Image, ImageTk
+
+from pathfinding_engine import MAX_COST, WALL
+
+# Side of one tile in screen pixels
+TILE_PX = 256
+
+# Pixels per cell the mouse wheel steps through
+ZOOM_LEVELS = (1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 4, 6, 8, 12, 16, 20, 30, 40, 60)
+
+# Cell borders are drawn from this many pixels per cell up
+GRIDLINE_MIN_PX = 6
+
+# Refreshing more cells than this repaints every visible tile instead
+REPAINT_ALL_CELLS = 4096
+
+FREE_COLOR = (0x2a, 0x2a, 0x2a)
+WALL_COLOR = (0x1a, 0x1a, 0x1a)
+VISITED_COLOR = (0x40, 0x40, 0x40)
+START_COLOR = (0x2d, 0x50, 0x16)  # dark green under the robot
+GOAL_COLOR = (0x4a, 0x1a, 0x1a)   # dark red under the flag
+GRIDLINE_COLOR = (0x3a, 0x3a, 0x3a)
+
+
+def _terrain_color(cost):
+    # Costlier terrain is drawn in warmer, brighter browns
+    shade = (cost - 1) / (MAX_COST - 1)
+    return int(0x3a + 0x50 * shade), int(0x33 + 0x28 * shade), 0x2a
+
+
+# Palette index = cost - 1 for free cells, then the special states
+PALETTE = np.array([FREE_COLOR] + [_terrain_color(cost) for cost in range(2, MAX_COST + 1)]
+                   + [WALL_COLOR, START_COLOR, GOAL_COLOR, VISITED_COLOR], dtype=np.uint8)
+WALL_INDEX, START_INDEX, GOAL_INDEX, VISITED_INDEX = range(MAX_COST, MAX_COST + 4)
+
+
+def nearest_zoom(cell_size):
+    """The largest zoom level not above ``cell_size`` (the smallest if none is)"""
+    fitting = [level for level in ZOOM_LEVELS if level <= cell_size]
+    return fitting[-1] if fitting else ZOOM_LEVELS[0]
+
+
+class BoardView:
+    """Draws one Grid onto ``canvas`` and maps canvas points back to cells.
+
+    ``visited``, ``start`` and ``goal`` describe the highlighted cells; set
+    them, then call ``refresh`` with the cells that changed.
+    """
+
+    def __init__(self, canvas, grid, cell_size):
+        self.canvas = canvas
+        self.tiles = {}  # (tile row, tile col) -> (PhotoImage, canvas item)
+        self.set_grid(grid, cell_size)
+
+    def set_grid(self, grid, cell_size):
+        self.grid = grid
+        self.visited = np.zeros((grid.rows, grid.cols), dtype=bool)
+        self.start = None
+        self.goal = None
+        self.set_zoom(nearest_zoom(cell_size))
+        self.redraw()
+
+    # -- geometry -------------------------------------------------------
+
+    def set_zoom(self, cell_size):
+        self.cell_size = cell_size
+        if cell_size >= 1:
+            self.step = 1
+            self.tile_cells = max(1, TILE_PX // int(cell_size))
+        else:
+            # Zoomed out: one pixel shows every step-th cell
+            self.step = round(1 / cell_size)
+            self.tile_cells = TILE_PX * self.step
+        self.canvas.config(scrollregion=(0, 0, self.grid.cols * cell_size, self.grid.rows * cell_size))
+
+    def zoom(self, steps, x, y):
+        """Move ``steps`` zoom levels in or out, keeping window point (x, y) still.
+
+        Returns the scale factor applied, or None when already at the limit.
+        """
+        level = ZOOM_LEVELS.index(self.cell_size)
+        new_level = min(max(level + steps, 0), len(ZOOM_LEVELS) - 1)
+        if new_level == level:
+            return None
+        old_size, new_size = self.cell_size, ZOOM_LEVELS[new_level]
+        # The board point under the pointer, in cells
+        col = self.canvas.canvasx(x) / old_size
+        row = self.canvas.canvasy(y) / old_size
+        self.set_zoom(new_size)
+        width, height = self.grid.cols * new_size, self.grid.rows * new_size
+        self.canvas.xview_moveto(max(0.0, col * new_size - x) / width)
+        self.canvas.yview_moveto(max(0.0, row * new_size - y) / height)
+        self.redraw()
+        return new_size / old_size
+
+    def cell_at(self, x, y):
+        """The cell under window point (x, y), or None off the board"""
+        row = int(self.canvas.canvasy(y) // self.cell_size)
+        col = int(self.canvas.canvasx(x) // self.cell_size)
+        return (row, col) if self.grid.in_bounds((row, col)) else None
+
+    def cell_center(self, cell):
+        r, c = cell
+        return (c + 0.5) * self.cell_size, (r + 0.5) * self.cell_size
+
+    # -- painting -------------------------------------------------------
+
+    def paint(self, r0, r1, c0, c1):
+        """RGB array of cells [r0:r1, c0:c1] at the current zoom"""
+        grid, step = self.grid, self.step
+        rows = slice(r0, r1, step)
+        cols = slice(c0, c1, step)
+        cells = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.rows, grid.cols)[rows, cols]
+        if grid.costs is None:
+            index = np.zeros(cells.shape, dtype=np.uint8)
+        else:
+            costs = np.frombuffer(grid.costs, dtype=np.uint8).reshape(grid.rows, grid.cols)
+            index = costs[rows, cols] - 1
+        index[cells == WALL] = WALL_INDEX
+        for cell, marker in ((self.start, START_INDEX), (self.goal, GOAL_INDEX)):
+            if cell is not None:
+                r, c = cell
+                if r0 <= r < r1 and c0 <= c < c1 and (r - r0) % step == 0 and (c - c0) % step == 0:
+                    index[(r - r0) // step, (c - c0) // step] = marker
+        index[self.visited[rows, cols]] = VISITED_INDEX
+        image = PALETTE[index]
+        if self.cell_size > 1:
+            size = int(self.cell_size)
+            image = image.repeat(size, axis=0).repeat(size, axis=1)
+            if size >= GRIDLINE_MIN_PX:
+                image[size - 1::size, :] = GRIDLINE_COLOR
+                image[:, size - 1::size] = GRIDLINE_COLOR
+        return image
+
+    def _tile_bounds(self, key):
+        tr, tc = key
+        n = self.tile_cells
+        return tr * n, min((tr + 1) * n, self.grid.rows), tc * n, min((tc + 1) * n, self.grid.cols)
+
+    def _draw_tile(self, key):
+        image = Image.fromarray(self.paint(*self._tile_bounds(key)))
+        tile = self.tiles.get(key)
+        if tile is not None:
+            tile[0].paste(image)
+            return
+        photo = ImageTk.PhotoImage(image)
+        tr, tc = key
+        size = self.tile_cells * self.cell_size
+        item = self.canvas.create_image(tc * size, tr * size, image=photo, anchor="nw", tags="tile")
+        self.canvas.tag_lower(item)
+        self.tiles[key] = (photo, item)
+
+    def visible_tiles(self):
+        """Keys of the tiles that overlap the visible part of the canvas"""
+        canvas = self.canvas
+        size = self.tile_cells * self.cell_size
+        left, top = canvas.canvasx(0), canvas.canvasy(0)
+        right = canvas.canvasx(canvas.winfo_width())
+        bottom = canvas.canvasy(canvas.winfo_height())
+        last_row = (self.grid.rows - 1) // self.tile_cells
+        last_col = (self.grid.cols - 1) // self.tile_cells
+        rows = range(max(0, int(top // size)), min(last_row, int(bottom // size)) + 1)
+        cols = range(max(0, int(left // size)), min(last_col, int(right // size)) + 1)
+        return {(tr, tc) for tr in rows for tc in cols}
+
+    def show_visible(self):
+        """Create tiles that scrolled into view and drop the ones that left it"""
+        visible = self.visible_tiles()
+        for key in list(self.tiles):
+            if key not in visible:
+                self.canvas.delete(self.tiles.pop(key)[1])
+        for key in visible:
+            if key not in self.tiles:
+                self._draw_tile(key)
+
+    def refresh(self, cells):
+        """Repaint the visible tiles that hold any of ``cells`` (a sized collection)"""
+        if len(cells) > REPAINT_ALL_CELLS:
+            keys = list(self.tiles)
+        else:
+            n = self.tile_cells
+            keys = {(r // n, c // n) for r, c in cells}
+        for key in keys:
+            if key in self.tiles:
+                self._draw_tile(key)
+
+    def redraw(self):
+        """Repaint everything, after a bulk change like a new maze or a zoom"""
+        self.canvas.delete("tile")
+        self.tiles.clear()
+        self.show_visible()
+
+    def mark_visited(self, cells, value=True):
+        """Set the visited highlight of ``cells`` (an iterable of (row, col))"""
+        cells = np.array(list(cells), dtype=np.intp).reshape(-1, 2)
+        self.visited[cells[:, 0], cells[:, 1]] = value
@@ -0,0 +1,216 @@
+"""Connected-component index: can start reach goal, in constant time.
+
+Every free cell is labelled with the id of its 4-connected region, so two
+cells are connected exactly when their labels match. The index reads the
+grid's change journal before answering, like the incremental planners:
+
+* a wall removed joins the regions around it; the smaller ones are
+  relabelled into the largest,
+* a wall added can split its region; searches started from each free
+  neighbor at once stop as soon as they meet, so only the part that broke
+  off gets relabelled.
+
+Bulk changes (a new maze) fall back to labelling the whole grid again.
+"""
+from array import array
+from collections import deque
+
+from pathfinding_engine import FREE, SearchStats
+
+UNLABELLED = -1
+
+# Relabel everything when one sync has more edits than this
+REBUILD_LIMIT = 1024
+
+
+class ConnectivityIndex:
+    """Region labels for one Grid"""
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.rebuild()
+
+    def rebuild(self):
+        grid = self.grid
+        self.version = grid.version
+        self.labels = array("i", [UNLABELLED]) * (grid.rows * grid.cols)
+        self.sizes = {}
+        self.next_label = 0
+        cells, labels = grid.cells, self.labels
+        for index in range(len(labels)):
+            if cells[index] == FREE and labels[index] == UNLABELLED:
+                self._flood(index, self._new_label())
+
+    def _new_label(self):
+        label = self.next_label
+        self.next_label += 1
+        self.sizes[label] = 0
+        return label
+
+    def _neighbors(self, index):
+        """Free 4-neighbors of a flat cell index"""
+        cols, cells = self.grid.cols, self.grid.cells
+        r, c = divmod(index, cols)
+        if r > 0 and cells[index - cols] == FREE:
+            yield index - cols
+        if r + 1 < self.grid.rows and cells[index + cols] == FREE:
+            yield index + cols
+        if c > 0 and cells[index - 1] == FREE:
+            yield index - 1
+        if c + 1 < cols and cells[index + 1] == FREE:
+            yield index + 1
+
+    def _flood(self, index, label):
+        """Give ``label`` to every free cell reachable from ``index``"""
+        labels, sizes = self.labels, self.sizes
+        taken_from = set()
+        queue = deque([index])
+        count = 0
+        while queue:
+            cell = queue.popleft()
+            if labels[cell] == label:
+                continue
+            if labels[cell] != UNLABELLED:
+                sizes[labels[cell]] -= 1
+                taken_from.add(labels[cell])
+            labels[cell] = label
+            count += 1
+            queue.extend(self._neighbors(cell))
+        sizes[label] += count
+        for old in taken_from:
+            if sizes[old] == 0:
+                del sizes[old]
+
+    def sync(self):
+        """Apply wall edits recorded in the grid journal"""
+        grid = self.grid
+        if self.version == grid.version:
+            return
+        changes = grid.changes_since(self.version)
+        self.version = grid.version
+        if changes is None or len(changes) > REBUILD_LIMIT:
+            self.rebuild()
+            return
+        cols, cells, labels = grid.cols, grid.cells, self.labels
+        walled, opened = [], []
+        for r, c in dict.fromkeys(changes):
+            index = r * cols + c
+            is_free = cells[index] == FREE
+            if is_free == (labels[index] != UNLABELLED):
+                continue  # a terrain edit, or toggled back and forth
+            (opened if is_free else walled).append(index)
+        # Walls first: until its turn, a newly opened cell has no label and
+        # the split searches treat it as still a wall
+        for index in walled:
+            label = labels[index]
+            labels[index] = UNLABELLED
+            self.sizes[label] -= 1
+            if self.sizes[label] == 0:
+                del self.sizes[label]
+        if walled:
+            self._walled(walled)
+        for index in opened:
+            self._opened(index)
+
+    def _opened(self, index):
+        """A wall was removed: join every region around it into the largest"""
+        around = {self.labels[n] for n in self._neighbors(index)} - {UNLABELLED}
+        if around:
+            label = max(around, key=self.sizes.get)
+        else:
+            label = self._new_label()
+        self._flood(index, label)
+
+    def _walled(self, indexes):
+        """Walls were added: split off whatever is no longer connected.
+
+        New walls can cut a region only together, so the split searches
+        start from the free neighbors of all of them at once.
+        """
+        by_label = {}
+        for index in indexes:
+            for neighbor in self._neighbors(index):
+                if self.labels[neighbor] != UNLABELLED:
+                    by_label.setdefault(self.labels[neighbor], {})[neighbor] = None
+        for label, starts in by_label.items():
+            if len(starts) > 1:
+                self._split(label, list(starts))
+
+    def _split(self, label, starts):
+        """Relabel the parts of region ``label`` that ``starts`` no longer share"""
+        # One breadth-first search per neighbor, advanced in turns. Searches
+        # that meet are merged into one group; a group that runs out of cells
+        # before meeting the rest is a separate region now.
+        count = len(starts)
+        group = list(range(count))
+        active = set(range(count))
+        seen = [{start} for start in starts]
+        owner = {start: i for i, start in enumerate(starts)}
+        queues = [deque([start]) for start in starts]
+
+        def root(i):
+            while group[i] != i:
+                i = group[i]
+            return i
+
+        while True:
+            members = {}
+            for i in active:
+                members.setdefault(root(i), []).append(i)
+            if len(members) < 2:
+                return
+            for searches in members.values():
+                if any(queues[i] for i in searches):
+                    continue
+                new_label = self._new_label()
+                for i in searches:
+                    for cell in seen[i]:
+                        self.labels[cell] = new_label
+                    self.sizes[new_label] += len(seen[i])
+                    self.sizes[label] -= len(seen[i])
+                    active.discard(i)
+                break
+            else:
+                for i in active:
+                    if not queues[i]:
+                        continue
+                    for neighbor in self._neighbors(queues[i].popleft()):
+                        if self.labels[neighbor] == UNLABELLED:
+                            continue
+                        other = owner.get(neighbor)
+                        if other is None:
+                            owner[neighbor] = i
+                            seen[i].add(neighbor)
+                            queues[i].append(neighbor)
+                        elif root(other) != root(i):
+                            group[root(other)] = root(i)
+
+    def connected(self, a, b):
+        """True if a path exists between cells a and b"""
+        self.sync()
+        cols = self.grid.cols
+        label = self.labels[a[0] * cols + a[1]]
+        return label != UNLABELLED and label == self.labels[b[0] * cols + b[1]]
+
+    def component(self, cell):
+        """Region id of ``cell``, or None for a wall"""
+        self.sync()
+        label = self.labels[cell[0] * self.grid.cols + cell[1]]
+        return None if label == UNLABELLED else label
+
+    def component_count(self):
+        self.sync()
+        return len(self.sizes)
+
+
+def index_for(grid):
+    """Return the index kept for this grid, built on first use and synced with its edits"""
+    return grid.attached("connectivity", ConnectivityIndex)
+
+
+def unreachable_result(algorithm, start, goal):
+    """The (path, stats) a search returns when it was skipped as unreachable"""
+    stats = SearchStats(algorithm)
+    stats.start, stats.goal = start, goal
+    stats.unreachable = True
+    return None, stats
@@ -0,0 +1,217 @@
+"""Goal distance fields: one wavefront per goal, O(1) lookups per robot.
+
+A field stores the BFS distance from every cell to one goal in a flat
+int32 array over a wall-padded copy of the grid. The padding means a
+neighbor is always ``index + offset`` with no bounds checks. Any start can
+then read its path length or next move directly instead of running its
+own search.
+"""
+import heapq
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from pathfinding_engine import FREE, register
+
+UNREACHABLE = -1
+
+# Above this many journal entries a full recompute beats patching
+REPATCH_LIMIT = 256
+
+MAX_FIELDS_PER_GRID = 8
+
+
+class DistanceField:
+    """BFS distances from every free cell to ``goal``"""
+
+    def __init__(self, grid, goal):
+        self.grid = grid
+        self.goal = goal
+        self.width = grid.cols + 2
+        self.steps = [-self.width, self.width, -1, 1]
+        self.offsets = np.array(self.steps)
+        self.cells_computed = 0
+        self.recompute()
+
+    def _index(self, cell):
+        return (cell[0] + 1) * self.width + cell[1] + 1
+
+    def _cell(self, index):
+        r, c = divmod(index, self.width)
+        return (r - 1, c - 1)
+
+    def recompute(self):
+        """Vectorized wavefront from the goal; each layer is one batch of array ops"""
+        grid = self.grid
+        cells = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.rows, grid.cols)
+        free = np.zeros((grid.rows + 2, grid.cols + 2), dtype=bool)
+        free[1:-1, 1:-1] = cells == FREE
+        self.free = free.ravel()
+        self.dist = np.full(self.free.size, UNREACHABLE, dtype=np.int32)
+        self.version = grid.version
+
+        goal = self._index(self.goal)
+        if not self.free[goal]:
+            return
+        self.dist[goal] = 0
+        frontier = np.array([goal])
+        distance = 0
+        while frontier.size:
+            distance += 1
+            candidates = (frontier[:, None] + self.offsets).ravel()
+            candidates = candidates[self.free[candidates] & (self.dist[candidates] == UNREACHABLE)]
+            frontier = np.unique(candidates)
+            self.dist[frontier] = distance
+            self.cells_computed += frontier.size
+        self.cells_computed += 1
+
+    def distances(self):
+        """Distance array shaped like the grid (-1 = unreachable or wall)"""
+        self.sync()
+        return self.dist.reshape(self.grid.rows + 2, self.width)[1:-1, 1:-1]
+
+    def sync(self):
+        """Patch the field for wall edits recorded in the grid journal"""
+        if self.version == self.grid.version:
+            return
+        changes = self.grid.changes_since(self.version)
+        if changes is None or len(changes) > REPATCH_LIMIT:
+            self.recompute()
+            return
+        self.version = self.grid.version
+        for cell in dict.fromkeys(changes):
+            index = self._index(cell)
+            is_free = not self.grid.is_wall(cell)
+            if self.free[index] == is_free:
+                continue
+            self.free[index] = is_free
+            if is_free:
+                self._patch_opened(index)
+            else:
+                self._patch_walled(index)
+
+    def _patch_opened(self, index):
+        """A wall was removed: distances can only shrink, spread the improvement"""
+        dist, free, steps = self.dist, self.free, self.steps
+        if index == self._index(self.goal):
+            dist[index] = 0
+        else:
+            known = [dist[index + step] for step in steps if free[index + step] and dist[index + step] >= 0]
+            if not known:
+                return
+            dist[index] = min(known) + 1
+        queue = deque([index])
+        while queue:
+            current = queue.popleft()
+            self.cells_computed += 1
+            next_distance = dist[current] + 1
+            for step in steps:
+                neighbor = current + step
+                if free[neighbor] and (dist[neighbor] < 0 or dist[neighbor] > next_distance):
+                    dist[neighbor] = next_distance
+                    queue.append(neighbor)
+
+    def _patch_walled(self, index):
+        """A wall was added: re-label only the cells whose every shortest route used it"""
+        dist, free, steps = self.dist, self.free, self.steps
+        if dist[index] < 0:
+            return
+        if index == self._index(self.goal):
+            dist[:] = UNREACHABLE
+            return
+
+        # Walk outwards one distance layer at a time; a cell is affected when
+        # none of its unaffected neighbors is one step closer to the goal
+        affected = {index}
+        layer = [index]
+        distance = int(dist[index])
+        while layer:
+            candidates = {current + step for current in layer for step in steps
+                          if free[current + step] and dist[current + step] == distance + 1}
+            layer = [cell for cell in candidates - affected
+                     if not any(free[cell + step] and dist[cell + step] == distance
+                                and cell + step not in affected for step in steps)]
+            affected.update(layer)
+            distance += 1
+
+        for cell in affected:
+            dist[cell] = UNREACHABLE
+        heap = []
+        for cell in affected:
+            if free[cell]:
+                known = [dist[cell + step] for step in steps if free[cell + step] and dist[cell + step] >= 0]
+                if known:
+                    heapq.heappush(heap, (int(min(known)) + 1, cell))
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if dist[cell] >= 0:
+                continue
+            dist[cell] = distance
+            self.cells_computed += 1
+            for step in steps:
+                neighbor = cell + step
+                if neighbor in affected and free[neighbor] and dist[neighbor] < 0:
+                    heapq.heappush(heap, (distance + 1, neighbor))
+
+    def distance(self, cell):
+        """Path length (in steps) from ``cell`` to the goal, or None"""
+        self.sync()
+        value = int(self.dist[self._index(cell)])
+        return None if value < 0 else value
+
+    def next_step(self, cell):
+        """The neighbor to move to from ``cell``, or None at the goal / when unreachable"""
+        value = self.distance(cell)
+        if not value:
+            return None
+        index = self._index(cell)
+        for step in self.steps:
+            if self.dist[index + step] == value - 1 and self.free[index + step]:
+                return self._cell(index + step)
+        return None
+
+    def path_from(self, start):
+        """Follow next_step from ``start`` to the goal"""
+        value = self.distance(start)
+        if value is None:
+            return None
+        path = [start]
+        index = self._index(start)
+        dist, free, steps = self.dist, self.free, self.steps
+        while value:
+            value -= 1
+            index = next(index + step for step in steps
+                         if free[index + step] and dist[index + step] == value)
+            path.append(self._cell(index))
+        return path
+
+
+def _fields_of(grid):
+    """The fields kept for this grid by goal, least recently used first"""
+    # Each field syncs itself, so only the ones still asked about do the work
+    return grid.attached("distance fields", lambda grid: OrderedDict(), sync=False)
+
+
+def field_for(grid, goal):
+    """Return the field kept for (grid, goal), built on first use and synced with its edits"""
+    fields = _fields_of(grid)
+    field = fields.get(goal)
+    if field is None:
+        field = fields[goal] = DistanceField(grid, goal)
+        if len(fields) > MAX_FIELDS_PER_GRID:
+            fields.popitem(last=False)
+    else:
+        field.sync()
+    fields.move_to_end(goal)
+    return field
+
+
+@register("Distance Field")
+def distance_field_search(grid, start, goal, stats):
+    """Look the path up in the goal's distance field (built or patched as needed)"""
+    field = _fields_of(grid).get(goal)
+    before = field.cells_computed if field else 0
+    field = field_for(grid, goal)
+    path = field.path_from(start)
+    stats.nodes_expanded = field.cells_computed - before
+    return path
@@ -0,0 +1,185 @@
+"""Incremental replanning with D* Lite.
+
+The planner searches backwards from the goal and keeps its g/rhs values
+between queries. Before each query it reads the grid's change journal and
+repairs only the vertices whose edges changed, so a wall toggled near the
+goal does not throw away the rest of the search. Moving the robot (the
+start) is handled with the usual key modifier.
+"""
+import heapq
+
+from pathfinding_engine import DIRECTIONS, SearchCancelled, manhattan, register, search
+
+INF = float("inf")
+
+# Fall back to a fresh search when a single sync has to repair more than
+# this fraction of the grid (e.g. after a new random maze)
+REBUILD_FRACTION = 0.25
+
+
+class DStarLite:
+    """D* Lite planner bound to one Grid"""
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.start = None
+        self.goal = None
+        self.version = grid.version
+        self.pushes = 0
+        self._reset()
+
+    def _reset(self):
+        self.g = {}
+        self.rhs = {}
+        self.open = {}
+        self.queue = []
+        self.km = 0
+        self.last_start = self.start
+        if self.goal is not None:
+            self.rhs[self.goal] = 0
+            self._push(self.goal)
+        self.rebuilt = True
+
+    def _key(self, state):
+        m = min(self.g.get(state, INF), self.rhs.get(state, INF))
+        return (m + manhattan(self.start, state) + self.km, m)
+
+    def _push(self, state):
+        key = self._key(state)
+        self.open[state] = key
+        heapq.heappush(self.queue, (key, state))
+        self.pushes += 1
+
+    def _adjacent(self, state):
+        """All in-bounds 4-neighbors; walls are handled through edge costs"""
+        r, c = state
+        rows, cols = self.grid.rows, self.grid.cols
+        for dr, dc in DIRECTIONS:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                yield (nr, nc)
+
+    def _update_vertex(self, state):
+        grid, g = self.grid, self.g
+        if state != self.goal:
+            best = INF
+            if not grid.is_wall(state):
+                for neighbor in self._adjacent(state):
+                    if not grid.is_wall(neighbor):
+                        cost = g.get(neighbor, INF) + 1
+                        if cost < best:
+                            best = cost
+            self.rhs[state] = best
+        if g.get(state, INF) != self.rhs.get(state, INF):
+            self._push(state)
+        else:
+            self.open.pop(state, None)
+
+    def _compute_shortest_path(self, order, stats):
+        g, rhs, queue, start = self.g, self.rhs, self.queue, self.start
+        while queue:
+            if len(self.open) > stats.peak_frontier:
+                stats.peak_frontier = len(self.open)
+            key, state = queue[0]
+            if self.open.get(state) != key:
+                heapq.heappop(queue)
+                continue
+            if key >= self._key(start) and rhs.get(start, INF) == g.get(start, INF):
+                break
+            heapq.heappop(queue)
+            new_key = self._key(state)
+            if key < new_key:
+                self.open[state] = new_key
+                heapq.heappush(queue, (new_key, state))
+                self.pushes += 1
+                continue
+            del self.open[state]
+            order.append(state)
+            if g.get(state, INF) > rhs.get(state, INF):
+                g[state] = rhs[state]
+            else:
+                g[state] = INF
+                self._update_vertex(state)
+            for neighbor in self._adjacent(state):
+                self._update_vertex(neighbor)
+
+    def sync(self):
+        """Pull wall edits from the grid journal and repair affected vertices"""
+        changes = self.grid.changes_since(self.version)
+        self.version = self.grid.version
+        if changes is None or len(changes) > REBUILD_FRACTION * self.grid.rows * self.grid.cols:
+            self._reset()
+            return
+        for cell in set(changes):
+            self._update_vertex(cell)
+            for neighbor in self._adjacent(cell):
+                self._update_vertex(neighbor)
+
+    def plan(self, start, goal, stats):
+        """Return the shortest path from start to goal, reusing earlier work.
+
+        Normally reached through ``search(grid, start, goal, "D* Lite")``,
+        which supplies ``stats`` and totals the expansions.
+        """
+        self.pushes = 0
+        self.rebuilt = False
+        if goal != self.goal:
+            self.goal = goal
+            self.start = start
+            self.version = self.grid.version
+            self._reset()
+        else:
+            if start != self.start:
+                # The robot moved: shift keys instead of re-sorting the queue
+                self.km += manhattan(self.last_start, start)
+                self.last_start = start
+                self.start = start
+            self.sync()
+        try:
+            self._compute_shortest_path(stats.expansion_order, stats)
+        except SearchCancelled:
+            # The queue is half-processed; start over on the next query
+            self.goal = None
+            raise
+        stats.pushes += self.pushes
+        stats.reused_state = not self.rebuilt
+        return self._extract_path()
+
+    def _extract_path(self):
+        g, grid = self.g, self.grid
+        if g.get(self.start, INF) == INF:
+            return None
+        path = [self.start]
+        current = self.start
+        for _ in range(grid.rows * grid.cols):
+            if current == self.goal:
+                return path
+            current = min((n for n in self._adjacent(current) if not grid.is_wall(n)),
+                          key=lambda n: g.get(n, INF), default=None)
+            if current is None or g.get(current, INF) == INF:
+                return None
+            path.append(current)
+        return None
+
+
+def planner_for(grid):
+    """Return the planner kept for this grid, creating it on first use"""
+    # plan() syncs itself: after shifting keys for a moved start, or not at all for a new goal
+    return grid.attached("D* Lite", DStarLite, sync=False)
+
+
+@register("D* Lite")
+def dstar_lite_search(grid, start, goal, stats):
+    return planner_for(grid).plan(start, goal, stats)
+
+
+def compare_with_astar(grid, start, goal):
+    """Replan with D* Lite and report its expansions next to a fresh A*"""
+    path, stats = search(grid, start, goal, "D* Lite")
+    _, astar_stats = search(grid, start, goal, "A*")
+    return {
+        "path_length": len(path) if path else None,
+        "dstar_lite_expanded": stats.nodes_expanded,
+        "astar_expanded": astar_stats.nodes_expanded,
+    }
+
@@ -0,0 +1,241 @@
+"""Searches over flat typed arrays, with buffers reused from query to query.
+
+The dict-based algorithms in pathfinding_engine allocate a dict entry, a
+(row, col) tuple and a tuple heap entry for every cell they touch. Here a
+cell is one integer, its index in a copy of the grid padded with a ring of
+walls, so a neighbor is ``index + offset`` with no bounds check. Costs,
+parents and visited marks live in typed arrays with one slot per cell,
+allocated once per grid and kept. Instead of clearing them, every query
+takes a new generation number: a slot counts as set only while its stamp
+equals the current generation. Heap entries pack (f, g, cell) into one
+int, which orders exactly like the tuple.
+
+Each algorithm registers next to the version it mirrors ("A* (flat)" for
+"A*") and returns the same path; ``DICT_VERSIONS`` maps one to the other
+for benchmarks.
+"""
+import heapq
+import threading
+from array import array
+from collections import deque
+
+from pathfinding_engine import FREE, MAX_COST, WALL, register
+
+# A stamp array is zeroed and the count restarted before it overflows
+MAX_GENERATION = 2 ** 32 - 1
+
+DICT_VERSIONS = {"A* (flat)": "A*", "Dijkstra (flat)": "Dijkstra", "BFS (flat)": "BFS"}
+
+
+class SearchBuffers:
+    """Padded cell copy and per-cell scratch arrays for one Grid.
+
+    Searches on the same grid take turns through ``lock``; the arrays are
+    shared, so two at once would overwrite each other's state.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.lock = threading.Lock()
+        self.width = grid.cols + 2
+        size = (grid.rows + 2) * self.width
+        # Same order as pathfinding_engine.DIRECTIONS
+        self.offsets = (-self.width, self.width, -1, 1)
+        # 32-bit slots: costs stay below MAX_COST * size, under 2**32 up to ~470M cells
+        self.cost = array("I", [0]) * size
+        self.parent = array("i", [0]) * size
+        self.seen = array("I", [0]) * size
+        self.closed = array("I", [0]) * size
+        self.generation = 0
+        # Heap keys are (f << f_shift) | (g << cell_bits) | cell
+        self.cell_bits = size.bit_length()
+        self.f_shift = self.cell_bits + (MAX_COST * size).bit_length()
+        self.rebuild()
+
+    def rebuild(self):
+        grid, width = self.grid, self.width
+        self.version = grid.version
+        self.cells = bytearray([WALL]) * len(self.seen)
+        self.costs = None if grid.costs is None else bytearray(len(self.seen))
+        for r in range(grid.rows):
+            row = slice((r + 1) * width + 1, (r + 1) * width + 1 + grid.cols)
+            self.cells[row] = grid.cells[r * grid.cols:(r + 1) * grid.cols]
+            if self.costs is not None:
+                self.costs[row] = grid.costs[r * grid.cols:(r + 1) * grid.cols]
+
+    def sync(self):
+        """Copy wall and cost edits from the grid journal into the padded arrays"""
+        grid = self.grid
+        if self.version == grid.version:
+            return
+        changes = grid.changes_since(self.version)
+        if changes is None or (grid.costs is None) != (self.costs is None):
+            self.rebuild()
+            return
+        self.version = grid.version
+        for r, c in changes:
+            index = (r + 1) * self.width + c + 1
+            self.cells[index] = grid.cells[r * grid.cols + c]
+            if self.costs is not None:
+                self.costs[index] = grid.costs[r * grid.cols + c]
+
+    def next_generation(self):
+        """Start a query: every seen/closed stamp from earlier queries goes stale"""
+        self.generation += 1
+        if self.generation == MAX_GENERATION:
+            size = len(self.seen)
+            self.seen = array("I", [0]) * size
+            self.closed = array("I", [0]) * size
+            self.generation = 1
+        return self.generation
+
+    @property
+    def nbytes(self):
+        """Memory held between queries"""
+        arrays = (self.cost, self.parent, self.seen, self.closed)
+        return (sum(len(a) * a.itemsize for a in arrays) + len(self.cells)
+                + (len(self.costs) if self.costs is not None else 0))
+
+    def index(self, state):
+        return (state[0] + 1) * self.width + state[1] + 1
+
+    def state(self, index):
+        r, c = divmod(index, self.width)
+        return r - 1, c - 1
+
+    def path_to(self, index):
+        """Follow parent links from ``index`` back to the start"""
+        parent, path = self.parent, []
+        while index >= 0:
+            path.append(self.state(index))
+            index = parent[index]
+        return path[::-1]
+
+
+def buffers_for(grid):
+    """Return the buffers kept for this grid, building them on first use"""
+    # Each search syncs them under the lock, since another may be using them
+    return grid.attached("flat buffers", SearchBuffers, sync=False)
+
+
+def _recorder(stats, buffers):
+    """The append used for expanded cells: (row, col) when the order is kept"""
+    expanded = stats.expansion_order
+    if isinstance(expanded, list):
+        state = buffers.state
+        return lambda index: expanded.append(state(index))
+    # Only counted; skip building the tuple
+    return expanded.append
+
+
+def _best_first(grid, start, goal, stats, use_heuristic):
+    """A* (or Dijkstra without the heuristic) on the flat arrays"""
+    buffers = buffers_for(grid)
+    with buffers.lock:
+        buffers.sync()
+        generation = buffers.next_generation()
+        cells, costs, offsets = buffers.cells, buffers.costs, buffers.offsets
+        cost, parent, seen, closed = buffers.cost, buffers.parent, buffers.seen, buffers.closed
+        width, cell_bits, f_shift = buffers.width, buffers.cell_bits, buffers.f_shift
+        cell_mask = (1 << cell_bits) - 1
+        g_mask = (1 << (f_shift - cell_bits)) - 1
+        source, target = buffers.index(start), buffers.index(goal)
+        goal_r, goal_c = divmod(target, width)
+        record = _recorder(stats, buffers)
+        push, pop = heapq.heappush, heapq.heappop
+        # Without a heuristic every step changes h by 0
+        flat_steps = tuple((offset, 0) for offset in offsets)
+        up, down, left, right = offsets
+
+        cost[source] = 0
+        parent[source] = -1
+        seen[source] = generation
+        h = 0
+        if use_heuristic:
+            source_r, source_c = divmod(source, width)
+            h = abs(source_r - goal_r) + abs(source_c - goal_c)
+        open_set = [h << f_shift | source]
+        pushes = 1
+        peak = 1
+        try:
+            while open_set:
+                if len(open_set) > peak:
+                    peak = len(open_set)
+                key = pop(open_set)
+                current = key & cell_mask
+                if closed[current] == generation:
+                    continue
+                closed[current] = generation
+                if current == target:
+                    return buffers.path_to(current)
+                record(current)
+                g = (key >> cell_bits) & g_mask
+                h = (key >> f_shift) - g
+                if use_heuristic:
+                    # One step changes the Manhattan distance by exactly one
+                    r, c = divmod(current, width)
+                    steps = ((up, -1 if r > goal_r else 1), (down, -1 if r < goal_r else 1),
+                             (left, -1 if c > goal_c else 1), (right, -1 if c < goal_c else 1))
+                else:
+                    steps = flat_steps
+                for offset, dh in steps:
+                    neighbor = current + offset
+                    if cells[neighbor] != FREE or closed[neighbor] == generation:
+                        continue
+                    new_cost = g + (1 if costs is None else costs[neighbor])
+                    if seen[neighbor] != generation or new_cost < cost[neighbor]:
+                        seen[neighbor] = generation
+                        cost[neighbor] = new_cost
+                        parent[neighbor] = current
+                        push(open_set, (new_cost + h + dh) << f_shift | new_cost << cell_bits | neighbor)
+                        pushes += 1
+            return None
+        finally:
+            stats.pushes += pushes
+            stats.peak_frontier = max(stats.peak_frontier, peak)
+
+
+@register("A* (flat)", weighted=True)
+def flat_astar_search(grid, start, goal, stats):
+    return _best_first(grid, start, goal, stats, use_heuristic=True)
+
+
+@register("Dijkstra (flat)", weighted=True)
+def flat_dijkstra_search(grid, start, goal, stats):
+    return _best_first(grid, start, goal, stats, use_heuristic=False)
+
+
+@register("BFS (flat)")
+def flat_bfs_search(grid, start, goal, stats):
+    buffers = buffers_for(grid)
+    with buffers.lock:
+        buffers.sync()
+        generation = buffers.next_generation()
+        cells, offsets, parent, seen = buffers.cells, buffers.offsets, buffers.parent, buffers.seen
+        source, target = buffers.index(start), buffers.index(goal)
+        record = _recorder(stats, buffers)
+
+        parent[source] = -1
+        seen[source] = generation
+        queue = deque([source])
+        pushes = 1
+        peak = 1
+        try:
+            while queue:
+                if len(queue) > peak:
+                    peak = len(queue)
+                current = queue.popleft()
+                if current == target:
+                    return buffers.path_to(current)
+                record(current)
+                for offset in offsets:
+                    neighbor = current + offset
+                    if cells[neighbor] == FREE and seen[neighbor] != generation:
+                        seen[neighbor] = generation
+                        parent[neighbor] = current
+                        queue.append(neighbor)
+                        pushes += 1
+            return None
+        finally:
+            stats.pushes += pushes
+            stats.peak_frontier = max(stats.peak_frontier, peak)
@@ -0,0 +1,336 @@
+"""Hierarchical pathfinding (HPA*) for very large maps.
+
+The grid is cut into square clusters. Wherever two neighboring clusters
+share a run of open cells, one or two transitions are placed across the
+border; their end cells are the nodes of an abstract graph. Inside each
+cluster the distances between its nodes are precomputed. A query links
+start and goal into the graph, searches the graph, and then refines each
+abstract hop into cells with a search confined to one cluster.
+
+Cluster tables are built the first time a query reaches a cluster (or all
+at once with ``precompute``) and kept between queries. Like D* Lite, the
+planner reads the grid's change journal before each query and drops only
+the tables of clusters touched by the edits.
+"""
+import heapq
+import time
+from collections import deque
+
+from pathfinding_engine import DIRECTIONS, FREE, manhattan, register
+
+CLUSTER_SIZE = 16
+
+# Border runs at least this long get a transition at each end instead of one in the middle
+WIDE_ENTRANCE = 6
+
+# Rebuild everything when a single sync touches more than this fraction of the clusters
+REBUILD_FRACTION = 0.25
+
+
+class HierarchicalPlanner:
+    """Abstract graph over one Grid's clusters"""
+
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE):
+        self.grid = grid
+        self.size = cluster_size
+        self.built_clusters = 0
+        self.cluster_rows = -(-grid.rows // cluster_size)
+        self.cluster_cols = -(-grid.cols // cluster_size)
+        self.build()
+
+    def build(self):
+        """Place every border's transitions; cluster tables are filled in on first use"""
+        self.version = self.grid.version
+        self.borders = {}
+        self.inter = {}
+        self.intra = {}
+        self.local = {}
+        for cr in range(self.cluster_rows):
+            for cc in range(self.cluster_cols):
+                for border in (((cr, cc), 0), ((cr, cc), 1)):
+                    self._build_border(border)
+
+    def precompute(self):
+        """Fill in every cluster's table now instead of during the first queries"""
+        for cr in range(self.cluster_rows):
+            for cc in range(self.cluster_cols):
+                self._edges((cr, cc))
+
+    def cluster_of(self, state):
+        return (state[0] // self.size, state[1] // self.size)
+
+    def _bounds(self, cluster):
+        cr, cc = cluster
+        r0, c0 = cr * self.size, cc * self.size
+        return r0, min(r0 + self.size, self.grid.rows), c0, min(c0 + self.size, self.grid.cols)
+
+    def _border_cells(self, border):
+        """Cell pairs across a border: side 0 is the cluster below, 1 the one to the right"""
+        (cr, cc), side = border
+        r0, r1, c0, c1 = self._bounds((cr, cc))
+        if side == 0:
+            if r1 >= self.grid.rows:
+                return []
+            return [((r1 - 1, c), (r1, c)) for c in range(c0, c1)]
+        if c1 >= self.grid.cols:
+            return []
+        return [((r, c1 - 1), (r, c1)) for r in range(r0, r1)]
+
+    def _build_border(self, border):
+        """Place transitions along one border and link them in ``inter``"""
+        for a, b in self.borders.pop(border, ()):
+            self.inter.get(a, {}).pop(b, None)
+            self.inter.get(b, {}).pop(a, None)
+        grid = self.grid
+        transitions = []
+        run = []
+        for a, b in self._border_cells(border) + [(None, None)]:
+            if a is not None and not grid.is_wall(a) and not grid.is_wall(b):
+                run.append((a, b))
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        self.borders[border] = transitions
+        for a, b in transitions:
+            self.inter.setdefault(a, {})[b] = grid.cost(b)
+            self.inter.setdefault(b, {})[a] = grid.cost(a)
+
+    def _cluster_borders(self, cluster):
+        """The (up to four) borders a cluster touches"""
+        cr, cc = cluster
+        borders = [(cluster, 0), (cluster, 1)]
+        if cr > 0:
+            borders.append(((cr - 1, cc), 0))
+        if cc > 0:
+            borders.append(((cr, cc - 1), 1))
+        return borders
+
+    def _nodes(self, cluster):
+        nodes = set()
+        for border in self._cluster_borders(cluster):
+            for pair in self.borders.get(border, ()):
+                nodes.update(cell for cell in pair if self.cluster_of(cell) == cluster)
+        return nodes
+
+    def _edges(self, cluster):
+        """Node-to-node costs inside ``cluster``, built once and kept until an edit touches it"""
+        edges = self.intra.get(cluster)
+        if edges is None:
+            edges = self._build_cluster(cluster)
+        return edges
+
+    def _build_cluster(self, cluster):
+        """Compute node-to-node costs inside one cluster"""
+        nodes = self._nodes(cluster)
+        edges = self.intra[cluster] = {node: self._local_search(node, cluster, nodes - {node})[0]
+                                       for node in nodes}
+        self.built_clusters += 1
+        return edges
+
+    def _local_graph(self, cluster):
+        """Neighbor lists (and terrain costs) over the cluster's local cell indices"""
+        graph = self.local.get(cluster)
+        if graph is not None:
+            return graph
+        r0, r1, c0, c1 = self._bounds(cluster)
+        grid = self.grid
+        cells, cols = grid.cells, grid.cols
+        adjacency = []
+        for r in range(r0, r1):
+            for c in range(c0, c1):
+                links = []
+                if cells[r * cols + c] == FREE:
+                    for dr, dc in DIRECTIONS:
+                        nr, nc = r + dr, c + dc
+                        if r0 <= nr < r1 and c0 <= nc < c1 and cells[nr * cols + nc] == FREE:
+                            links.append((nr - r0) * (c1 - c0) + nc - c0)
+                adjacency.append(links)
+        costs = None
+        if grid.costs is not None:
+            costs = [grid.costs[r * cols + c] for r in range(r0, r1) for c in range(c0, c1)]
+        graph = self.local[cluster] = (adjacency, costs)
+        return graph
+
+    def _local_search(self, source, cluster, targets, reverse=False, order=None, want_path=False):
+        """Search from ``source`` that never leaves ``cluster``.
+
+        Stops once every cell in ``targets`` is settled and returns
+        ({target: cost}, path), where the path (to the single target) is
+        only built when ``want_path`` is set. With ``reverse`` the cost of
+        a step is the cell being left, which gives costs *to* ``source``.
+        Runs over local cell indices: BFS on plain floor, Dijkstra on terrain.
+        """
+        r0, _, c0, c1 = self._bounds(cluster)
+        width = c1 - c0
+        adjacency, costs = self._local_graph(cluster)
+        wanted = {(r - r0) * width + c - c0: (r, c) for r, c in targets}
+        source_index = (source[0] - r0) * width + source[1] - c0
+        found = {}
+        came_from = {source_index: None}
+        if costs is None:
+            queue = deque([source_index])
+            dist = {source_index: 0}
+            while queue and len(found) < len(wanted):
+                current = queue.popleft()
+                if order is not None:
+                    order.append((r0 + current // width, c0 + current % width))
+                if current in wanted:
+                    found[current] = dist[current]
+                d = dist[current] + 1
+                for neighbor in adjacency[current]:
+                    if neighbor not in dist:
+                        dist[neighbor] = d
+                        came_from[neighbor] = current
+                        queue.append(neighbor)
+        else:
+            queue = [(0, source_index)]
+            dist = {source_index: 0}
+            settled = set()
+            while queue and len(found) < len(wanted):
+                d, current = heapq.heappop(queue)
+                if current in settled:
+                    continue
+                settled.add(current)
+                if order is not None:
+                    order.append((r0 + current // width, c0 + current % width))
+                if current in wanted:
+                    found[current] = d
+                leave_cost = costs[current]
+                for neighbor in adjacency[current]:
+                    new_dist = d + (leave_cost if reverse else costs[neighbor])
+                    if neighbor not in dist or new_dist < dist[neighbor]:
+                        dist[neighbor] = new_dist
+                        came_from[neighbor] = current
+                        heapq.heappush(queue, (new_dist, neighbor))
+
+        path = None
+        if want_path and found:
+            index = next(iter(found))
+            path = []
+            while index is not None:
+                path.append((r0 + index // width, c0 + index % width))
+                index = came_from[index]
+            path.reverse()
+        return {wanted[index]: cost for index, cost in found.items()}, path
+
+    def sync(self):
+        """Pull wall and terrain edits from the grid journal and rebuild only what they touch"""
+        changes = self.grid.changes_since(self.version)
+        self.version = self.grid.version
+        if changes is None:
+            self.build()
+            return
+        borders, clusters = set(), set()
+        for cell in set(changes):
+            cluster = self.cluster_of(cell)
+            clusters.add(cluster)
+            for border in self._cluster_borders(cluster):
+                pairs = self._border_cells(border)
+                # Only cells right on a border can change its transitions
+                if any(cell in pair for pair in pairs):
+                    borders.add(border)
+                    clusters.update(self.cluster_of(c) for c in pairs[0])
+        if len(clusters) > REBUILD_FRACTION * self.cluster_rows * self.cluster_cols:
+            self.build()
+            return
+        for border in borders:
+            self._build_border(border)
+        for cluster in clusters:
+            self.intra.pop(cluster, None)
+            self.local.pop(cluster, None)
+
+    def plan(self, start, goal, stats):
+        """Return a start-goal path: abstract search first, then per-cluster refinement.
+
+        Normally reached through ``search(grid, start, goal, "HPA*")``.
+        Abstract and refinement work are reported separately in ``stats``.
+        """
+        if self.version != self.grid.version:
+            self.sync()
+        built = self.built_clusters
+        order = stats.expansion_order
+        began = time.perf_counter()
+        before = len(order)
+        hops = self._abstract_search(start, goal, order, stats)
+        stats.abstract_expanded = len(order) - before
+        stats.abstract_time = time.perf_counter() - began
+
+        began = time.perf_counter()
+        before = len(order)
+        path = self._refine(hops, order) if hops else None
+        stats.refine_expanded = len(order) - before
+        stats.refine_time = time.perf_counter() - began
+        stats.built_clusters = self.built_clusters - built
+        return path
+
+    def _link(self, endpoint, reverse, order):
+        """Costs between a query endpoint and the nodes of its cluster"""
+        cluster = self.cluster_of(endpoint)
+        return self._local_search(endpoint, cluster, self._nodes(cluster) - {endpoint}, reverse, order)[0]
+
+    def _abstract_search(self, start, goal, order, stats):
+        """A* over the abstract graph with start and goal linked in temporarily"""
+        if start == goal:
+            return [start]
+        from_start = self._link(start, False, order)
+        to_goal = self._link(goal, True, order)
+        if self.cluster_of(start) == self.cluster_of(goal):
+            from_start.update(self._local_search(start, self.cluster_of(start), {goal}, order=order)[0])
+
+        queue = [(manhattan(start, goal), 0, start, None)]
+        stats.pushes += 1
+        came_from = {}
+        cost_so_far = {start: 0}
+        while queue:
+            if len(queue) > stats.peak_frontier:
+                stats.peak_frontier = len(queue)
+            _, g, current, parent = heapq.heappop(queue)
+            if current in came_from:
+                continue
+            came_from[current] = parent
+            if current == goal:
+                hops = [current]
+                while came_from[current] is not None:
+                    current = came_from[current]
+                    hops.append(current)
+                return hops[::-1]
+            order.append(current)
+            if current == start:
+                # A start on a cluster border also has its own crossing edge
+                edges = list(from_start.items()) + list(self.inter.get(start, {}).items())
+            else:
+                edges = list(self._edges(self.cluster_of(current)).get(current, {}).items())
+                edges += self.inter.get(current, {}).items()
+                if current in to_goal:
+                    edges.append((goal, to_goal[current]))
+            for neighbor, cost in edges:
+                new_cost = g + cost
+                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = new_cost
+                    heapq.heappush(queue, (new_cost + manhattan(neighbor, goal), new_cost, neighbor, current))
+                    stats.pushes += 1
+        return None
+
+    def _refine(self, hops, order):
+        """Turn abstract hops into cells; hops across a border are already adjacent"""
+        path = [hops[0]]
+        for a, b in zip(hops, hops[1:]):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                path.append(b)
+                continue
+            path.extend(self._local_search(a, cluster, {b}, order=order, want_path=True)[1][1:])
+        return path
+
+
+def planner_for(grid):
+    """Return the planner kept for this grid, built on first use and synced with its edits"""
+    return grid.attached("HPA*", HierarchicalPlanner)
+
+
+@register("HPA*", weighted=True)
+def hpa_search(grid, start, goal, stats):
+    return planner_for(grid).plan(start, goal, stats)
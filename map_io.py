@@ -0,0 +1,126 @@
+"""Saving and loading maps: a bit-packed binary format and Moving AI benchmarks.
+
+Binary map layout (little-endian):
+
+    magic   8 bytes   b"RPMAP\\x00\\x01\\x00"
+    rows    uint32
+    cols    uint32
+    flags   uint32    bit 0 set when a terrain cost section follows
+    walls   ceil(rows * cols / 8) bytes, one bit per cell, row-major
+    costs   rows * cols bytes (only with flag bit 0)
+
+The file is memory-mapped on load and the wall bits are unpacked in one
+vectorized call, so opening a map costs about one byte of work per cell
+and no text parsing. On disk a map takes one bit per cell, plus a byte per
+cell when it has terrain costs.
+
+Moving AI maps (https://movingai.com/benchmarks/) are text grids where
+".", "G" and "S" are passable and every other character is blocked. Their
+.scen files list start/goal pairs with the optimal octile (8-connected)
+length; this engine moves 4-connected, so its path lengths differ.
+"""
+import os
+import struct
+
+import numpy as np
+
+from pathfinding_engine import MAX_COST, MIN_COST, Grid
+
+MAGIC = b"RPMAP\x00\x01\x00"
+HEADER = struct.Struct("<8sIII")
+HAS_COSTS = 1
+
+MOVINGAI_PASSABLE = b".GS"
+
+
+def save_map(grid, path):
+    """Write ``grid`` (walls and any terrain costs) to a binary map file"""
+    cells = np.frombuffer(grid.cells, dtype=np.uint8)
+    flags = HAS_COSTS if grid.costs is not None else 0
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, grid.rows, grid.cols, flags))
+        f.write(np.packbits(cells).tobytes())
+        if grid.costs is not None:
+            f.write(bytes(grid.costs))
+
+
+def read_header(path):
+    """Return (rows, cols, flags) without touching the cell data"""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is too short to be a map file")
+    magic, rows, cols, flags = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a map file")
+    return rows, cols, flags
+
+
+def load_map(path):
+    """Open a binary map file as a Grid"""
+    rows, cols, flags = read_header(path)
+    packed_size = (rows * cols + 7) // 8
+    expected = HEADER.size + packed_size + (rows * cols if flags & HAS_COSTS else 0)
+    if os.path.getsize(path) != expected:
+        raise ValueError(f"{path} is truncated or has trailing data")
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    walls = np.unpackbits(data[HEADER.size:HEADER.size + packed_size], count=rows * cols)
+    grid = Grid(rows, cols, walls)
+    if flags & HAS_COSTS:
+        costs = data[HEADER.size + packed_size:]
+        if costs.size and not MIN_COST <= int(costs.min()) <= int(costs.max()) <= MAX_COST:
+            raise ValueError(f"{path} has terrain costs outside {MIN_COST}..{MAX_COST}")
+        grid.costs = bytearray(costs)
+    return grid
+
+
+def load_movingai_map(path):
+    """Read a Moving AI .map file into a Grid"""
+    with open(path, "rb") as f:
+        header = {}
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError(f"{path} has no 'map' line")
+            line = line.strip()
+            if line == b"map":
+                break
+            key, _, value = line.partition(b" ")
+            header[key.decode()] = value.decode()
+        body = f.read()
+    rows, cols = int(header["height"]), int(header["width"])
+    chars = np.frombuffer(body.replace(b"\r", b"").replace(b"\n", b""), dtype=np.uint8)
+    if chars.size < rows * cols:
+        raise ValueError(f"{path} has fewer cells than its {rows}x{cols} header")
+    passable = np.isin(chars[:rows * cols], np.frombuffer(MOVINGAI_PASSABLE, dtype=np.uint8))
+    return Grid(rows, cols, (~passable).astype(np.uint8))
+
+
+def load_movingai_scen(path):
+    """Read a Moving AI .scen file into a list of scenario dicts.
+
+    Each dict has "bucket", "map", "start" and "goal" as (row, col), and
+    "optimal_length" (octile distance, see the module docstring).
+    """
+    scenarios = []
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) != 9 or fields[0] == "version":
+                continue
+            bucket, map_name, _, _, sx, sy, gx, gy, optimal = fields
+            scenarios.append({
+                "bucket": int(bucket),
+                "map": map_name,
+                "start": (int(sy), int(sx)),
+                "goal": (int(gy), int(gx)),
+                "optimal_length": float(optimal),
+            })
+    return scenarios
+
+
+def load_any(path):
+    """Open a binary map or a Moving AI .map, picked by file extension"""
+    if path.endswith(".map"):
+        return load_movingai_map(path)
+    return load_map(path)
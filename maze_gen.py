@@ -0,0 +1,193 @@
+"""Seeded maze generators backed by NumPy arrays.
+
+Every generator returns a (rows, cols) uint8 array of 0 = free, 1 = wall
+and takes a ``seed``; the same seed and size always give the same maze.
+``generate`` writes one into a Grid and can guarantee that a start and a
+goal are connected, and ``solvable_maps`` turns that into a bulk source of
+test maps.
+
+Random walls and cellular-automaton caves are pure array operations. The
+recursive backtracker and Kruskal's algorithm carve a perfect maze over the
+even-indexed "room" cells; their loops run once per room, a quarter of the
+cells.
+"""
+from collections import deque
+
+import numpy as np
+
+from pathfinding_engine import FREE, WALL, Grid
+
+# Cave rules: start with this much rock, then a cell becomes rock when at
+# least CAVE_BIRTH cells of its 3x3 block (itself included) are rock
+CAVE_FILL = 0.45
+CAVE_BIRTH = 5
+CAVE_STEPS = 5
+
+
+def random_walls(rows, cols, density=0.3, seed=None):
+    """Each cell is a wall with probability ``density``"""
+    rng = np.random.default_rng(seed)
+    return (rng.random((rows, cols)) < density).astype(np.uint8)
+
+
+def recursive_backtracker(rows, cols, seed=None):
+    """Perfect maze by randomized depth-first search: long, winding corridors"""
+    rng = np.random.default_rng(seed)
+    room_rows, room_cols = (rows + 1) // 2, (cols + 1) // 2
+    cells = np.ones((rows, cols), dtype=np.uint8)
+    visited = np.zeros((room_rows, room_cols), dtype=bool)
+    # One random direction order per room, drawn up front
+    orders = rng.permuted(np.tile(np.arange(4), (room_rows * room_cols, 1)), axis=1)
+    steps = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+    stack = [(0, 0)]
+    visited[0, 0] = True
+    cells[0, 0] = FREE
+    while stack:
+        r, c = stack[-1]
+        for direction in orders[r * room_cols + c]:
+            dr, dc = steps[direction]
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < room_rows and 0 <= nc < room_cols and not visited[nr, nc]:
+                visited[nr, nc] = True
+                cells[2 * nr, 2 * nc] = FREE
+                cells[2 * r + dr, 2 * c + dc] = FREE
+                stack.append((nr, nc))
+                break
+        else:
+            stack.pop()
+    return cells
+
+
+def kruskal(rows, cols, seed=None):
+    """Perfect maze by randomized Kruskal's algorithm: many short dead ends"""
+    rng = np.random.default_rng(seed)
+    room_rows, room_cols = (rows + 1) // 2, (cols + 1) // 2
+    cells = np.ones((rows, cols), dtype=np.uint8)
+    cells[::2, ::2] = FREE
+
+    # Candidate walls between horizontally and vertically adjacent rooms
+    ids = np.arange(room_rows * room_cols).reshape(room_rows, room_cols)
+    edges = np.concatenate([
+        np.stack([ids[:, :-1].ravel(), ids[:, 1:].ravel()], axis=1),
+        np.stack([ids[:-1, :].ravel(), ids[1:, :].ravel()], axis=1),
+    ])
+    edges = edges[rng.permutation(len(edges))]
+
+    parent = list(range(room_rows * room_cols))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in edges.tolist():
+        root_a, root_b = find(a), find(b)
+        if root_a == root_b:
+            continue
+        parent[root_a] = root_b
+        ra, ca = divmod(a, room_cols)
+        rb, cb = divmod(b, room_cols)
+        cells[ra + rb, ca + cb] = FREE
+    return cells
+
+
+def cellular_caves(rows, cols, seed=None, fill=CAVE_FILL, steps=CAVE_STEPS):
+    """Organic caves: random rock smoothed by a few cellular-automaton steps"""
+    rock = random_walls(rows, cols, fill, seed)
+    for _ in range(steps):
+        # The border counts as rock so caves close off at the map edge
+        padded = np.pad(rock, 1, constant_values=WALL)
+        block = sum(padded[1 + dr:rows + 1 + dr, 1 + dc:cols + 1 + dc]
+                    for dr in (-1, 0, 1) for dc in (-1, 0, 1))
+        rock = (block >= CAVE_BIRTH).astype(np.uint8)
+    return rock
+
+
+STYLES = {
+    "Random": random_walls,
+    "Backtracker": recursive_backtracker,
+    "Kruskal": kruskal,
+    "Caves": cellular_caves,
+}
+
+
+def _cells_array(grid):
+    return np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.rows, grid.cols)
+
+
+def carve_connection(grid, start, goal):
+    """Knock out the fewest walls needed for start to reach goal.
+
+    A 0-1 BFS where entering a wall costs 1 and a free cell costs 0; the
+    walls on the cheapest route are removed. Returns how many were removed.
+    """
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    source, target = start[0] * cols + start[1], goal[0] * cols + goal[1]
+    cost = {source: cells[source]}
+    came_from = {source: None}
+    queue = deque([source])
+    while queue:
+        index = queue.popleft()
+        if index == target:
+            break
+        r, c = divmod(index, cols)
+        for neighbor, ok in ((index - cols, r > 0), (index + cols, r + 1 < rows),
+                             (index - 1, c > 0), (index + 1, c + 1 < cols)):
+            if not ok:
+                continue
+            new_cost = cost[index] + cells[neighbor]
+            if neighbor not in cost or new_cost < cost[neighbor]:
+                cost[neighbor] = new_cost
+                came_from[neighbor] = index
+                # Free cells go to the front, walls to the back
+                if cells[neighbor] == FREE:
+                    queue.appendleft(neighbor)
+                else:
+                    queue.append(neighbor)
+    removed = 0
+    index = target
+    while index is not None:
+        if cells[index] == WALL:
+            cells[index] = FREE
+            removed += 1
+        index = came_from[index]
+    return removed
+
+
+def generate(grid, style="Random", density=0.3, seed=None, keep_free=(), connect=None):
+    """Fill ``grid`` with a maze of the given style.
+
+    ``density`` only applies to "Random". Cells in ``keep_free`` are always
+    left open. Pass ``connect=(start, goal)`` to guarantee the two are
+    connected; any walls in the way are removed with carve_connection.
+    """
+    try:
+        make = STYLES[style]
+    except KeyError:
+        raise ValueError(f"Unknown maze style: {style}") from None
+    if style == "Random":
+        maze = make(grid.rows, grid.cols, density, seed)
+    else:
+        maze = make(grid.rows, grid.cols, seed)
+    _cells_array(grid)[:] = maze
+    for state in keep_free:
+        if state is not None:
+            grid.cells[state[0] * grid.cols + state[1]] = FREE
+    if connect is not None and None not in connect:
+        carve_connection(grid, *connect)
+    grid.mark_changed()
+    return grid
+
+
+def solvable_maps(count, rows, cols, style="Random", density=0.3, seed=0):
+    """Yield ``count`` (grid, start, goal) maps whose corners are connected.
+
+    Map ``i`` uses seed ``seed + i``, so any single map can be rebuilt later.
+    """
+    start, goal = (0, 0), (rows - 1, cols - 1)
+    for i in range(count):
+        grid = generate(Grid(rows, cols), style, density, seed + i,
+                        keep_free=(start, goal), connect=(start, goal))
+        yield grid, start, goal
@@ -0,0 +1,299 @@
+"""Cooperative pathfinding for many robots sharing one grid.
+
+Robots are planned one after another (prioritized planning). Each plan is
+a space-time A* over (cell, time) states that may also wait in place, and
+every planned path is written to a reservation table that later robots
+must avoid: no two robots on one cell at the same time step, and no two
+robots swapping cells across one step. A robot that has arrived stays
+parked on its flag, and one that can't be planned stays parked on its
+start; when that start lies on an earlier robot's route, planning starts
+over with the stuck robot first.
+
+The heuristic is the robot's exact distance to its flag, computed lazily
+by a reverse A* from the flag that resumes only when asked about a cell it
+hasn't reached yet (Reverse Resumable A*). A robot with no one in the way
+walks straight home, and the work per robot stays close to the area around
+its route instead of the whole map. All moves take one time step; terrain
+costs are not used.
+"""
+import argparse
+import heapq
+import json
+import random
+import time
+
+from connectivity import index_for
+from pathfinding_engine import FREE, SearchCancelled, SearchStats, manhattan
+
+# Default time horizon: the robot's free-space distance times this, plus WAIT_SLACK steps
+HORIZON_FACTOR = 3
+WAIT_SLACK = 32
+
+# A robot gives up after this many expansions per step of its time horizon
+EXPANSIONS_PER_STEP = 100
+
+
+class ReverseResumableAStar:
+    """Exact distances to ``goal``, searched backwards from it on demand"""
+
+    def __init__(self, grid, goal, start):
+        self.grid = grid
+        self.target = start
+        self.open = [(manhattan(goal, start), 0, goal)]
+        self.closed = {}
+        self.cost_so_far = {goal: 0}
+
+    def distance(self, cell):
+        """Steps from ``cell`` to the goal, or None if it can't get there"""
+        closed = self.closed
+        if cell in closed:
+            return closed[cell]
+        open_set, cost_so_far, target = self.open, self.cost_so_far, self.target
+        while open_set:
+            _, g, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed[current] = g
+            for neighbor in self.grid.neighbors(current):
+                if neighbor not in cost_so_far or g + 1 < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = g + 1
+                    heapq.heappush(open_set, (g + 1 + manhattan(neighbor, target), g + 1, neighbor))
+            if current == cell:
+                return g
+        return None
+
+
+class ReservationTable:
+    """Which robot holds each (cell, time) and each move across a step"""
+
+    def __init__(self):
+        self.cells = {}
+        self.moves = set()
+        # cell -> time a robot parks there for good
+        self.parked = {}
+        # cell -> last time any robot passes through it
+        self.last_use = {}
+
+    def is_free(self, cell, t):
+        parked = self.parked.get(cell)
+        return (cell, t) not in self.cells and (parked is None or t < parked)
+
+    def can_move(self, cell, next_cell, t):
+        """True if moving cell -> next_cell between t and t+1 hits no one"""
+        return self.is_free(next_cell, t + 1) and (next_cell, cell, t) not in self.moves
+
+    def can_park(self, cell, t):
+        """True if no robot passes through ``cell`` at or after ``t``"""
+        return self.last_use.get(cell, -1) < t and cell not in self.parked
+
+    def reserve(self, agent, path):
+        for t, cell in enumerate(path):
+            self.cells[(cell, t)] = agent
+            if t > self.last_use.get(cell, -1):
+                self.last_use[cell] = t
+        for t in range(len(path) - 1):
+            self.moves.add((path[t], path[t + 1], t))
+        self.parked[path[-1]] = len(path) - 1
+
+
+def space_time_astar(grid, start, goal, table, field, stats, max_time=None):
+    """Shortest timed path from start to goal that respects ``table``.
+
+    ``path[t]`` is the robot's cell at time t; repeated cells are waits.
+    ``field`` is anything with a ``distance(cell)`` method that returns
+    the exact free-space distance to the goal, or None.
+    """
+    h = field.distance(start)
+    if h is None:
+        return None
+    if max_time is None:
+        max_time = HORIZON_FACTOR * h + WAIT_SLACK
+    budget = EXPANSIONS_PER_STEP * max_time
+    if not table.is_free(start, 0):
+        return None
+    # No plan can end before the last robot has crossed the flag
+    park_time = table.last_use.get(goal, -1) + 1
+    # Ties on f go to the later state, which is the one closer to finishing
+    open_set = [(max(h, park_time), 0, start, None)]
+    stats.pushes += 1
+    came_from = {}
+    # cell -> first time we reached it with no reservations on it afterwards;
+    # arriving there any later is never better than waiting
+    settled = {}
+    last_use, parked = table.last_use, table.parked
+    expanded = stats.expansion_order
+
+    while open_set:
+        if len(open_set) > stats.peak_frontier:
+            stats.peak_frontier = len(open_set)
+        _, negative_t, cell, parent = heapq.heappop(open_set)
+        t = -negative_t
+        if (cell, t) in came_from or settled.get(cell, t) < t:
+            continue
+        came_from[(cell, t)] = parent
+        if last_use.get(cell, -1) < t and cell not in parked and cell not in settled:
+            settled[cell] = t
+        if cell == goal and table.can_park(cell, t):
+            path = [cell]
+            state = parent
+            while state is not None:
+                path.append(state[0])
+                state = came_from[state]
+            return path[::-1]
+        expanded.append(cell)
+        if len(expanded) > budget:
+            return None
+        if t >= max_time:
+            continue
+        for next_cell in grid.neighbors(cell) + [cell]:
+            if (next_cell, t + 1) in came_from or settled.get(next_cell, t + 1) < t + 1:
+                continue
+            if not table.can_move(cell, next_cell, t):
+                continue
+            distance = field.distance(next_cell)
+            if distance is None:
+                continue
+            heapq.heappush(open_set, (max(t + 1 + distance, park_time), -t - 1, next_cell, (cell, t)))
+            stats.pushes += 1
+    return None
+
+
+def plan_agents(grid, agents, max_time=None, cancel=None):
+    """Plan collision-free timed paths for a list of (start, goal) pairs.
+
+    Robots are planned in list order. Returns a (path, stats) pair per
+    robot, in list order; the path is None when no timed path fits within
+    the horizon, and that robot then stays parked on its start cell.
+    Robots planned after it go around it. If one planned before it passes
+    through that cell, planning starts over with the stuck robot moved to
+    the front; one that still fails there is parked before anyone moves.
+    Each stats record carries that robot's own planning time in
+    ``wall_time``, including its heuristic search and any earlier rounds.
+    """
+    first = []  # robots moved to the front, in the order they got stuck
+    parked = []  # robots stuck even at the front: they never move
+    spent = [0.0] * len(agents)
+    while True:
+        table = ReservationTable()
+        results = {}
+        for agent in parked:
+            start, goal = agents[agent]
+            table.reserve(agent, [start])
+            stats = SearchStats("Cooperative A*", record_order=False)
+            stats.start, stats.goal = start, goal
+            stats.wall_time = spent[agent]
+            results[agent] = (None, stats)
+        ahead = set(first) | set(parked)
+        order = first + [agent for agent in range(len(agents)) if agent not in ahead]
+        stuck = None
+        for agent in order:
+            start, goal = agents[agent]
+            stats = SearchStats("Cooperative A*", record_order=False, cancel=cancel)
+            stats.start, stats.goal = start, goal
+            began = time.perf_counter()
+            path = None
+            try:
+                field = ReverseResumableAStar(grid, goal, start)
+                path = space_time_astar(grid, start, goal, table, field, stats, max_time)
+            except SearchCancelled:
+                stats.cancelled = True
+            spent[agent] += time.perf_counter() - began
+            stats.wall_time = spent[agent]
+            stats.nodes_expanded = len(stats.expansion_order)
+            if path:
+                table.reserve(agent, path)
+                stats.path_length = len(path)
+                stats.wait_steps = sum(a == b for a, b in zip(path, path[1:]))
+            elif not stats.cancelled:
+                if start in table.last_use:
+                    # A robot planned earlier drives through this one
+                    stuck = agent
+                    break
+                # A robot with no plan stays where it is; later robots go around it
+                table.reserve(agent, [start])
+            results[agent] = (path, stats)
+            if stats.cancelled:
+                break
+        if stuck is None:
+            return [results[agent] for agent in sorted(results)]
+        # Every round moves one robot up a stage, so this ends
+        if stuck in first:
+            first.remove(stuck)
+            parked.append(stuck)
+        else:
+            first.append(stuck)
+
+
+def random_agents(grid, count, seed=None):
+    """Pick ``count`` robot/flag pairs on distinct free cells.
+
+    Each flag is in the same connected region as its robot, so every pair
+    can reach its flag when the other robots are ignored.
+    """
+    rng = random.Random(seed)
+    region = index_for(grid).labels
+    free = [i for i, value in enumerate(grid.cells) if value == FREE]
+    rng.shuffle(free)
+    # Pair cells up region by region in shuffled order
+    waiting = {}
+    agents = []
+    for index in free:
+        if len(agents) == count:
+            break
+        other = waiting.pop(region[index], None)
+        if other is None:
+            waiting[region[index]] = index
+        else:
+            agents.append((divmod(other, grid.cols), divmod(index, grid.cols)))
+    return agents
+
+
+def summary(results):
+    """Planning totals for a plan_agents result"""
+    times = [stats.wall_time for _, stats in results]
+    planned = [path for path, _ in results if path]
+    return {
+        "agents": len(results),
+        "planned": len(planned),
+        "total_time": sum(times),
+        "mean_time_per_agent": sum(times) / len(times) if times else 0.0,
+        "max_time_per_agent": max(times, default=0.0),
+        "makespan": max((len(path) - 1 for path in planned), default=0),
+    }
+
+
+def check_collisions(paths, agents):
+    """Return (time, cell) conflicts between timed paths (parked robots included).
+
+    ``paths[i]`` belongs to the robot at ``agents[i]``; a robot without a
+    path counts as parked on its start for the whole run.
+    """
+    paths = [path or [start] for path, (start, _) in zip(paths, agents)]
+    horizon = max((len(path) for path in paths), default=0)
+    conflicts = []
+    for t in range(horizon):
+        seen = {}
+        for path in paths:
+            cell = path[min(t, len(path) - 1)]
+            if cell in seen:
+                conflicts.append((t, cell))
+            seen[cell] = True
+    return conflicts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan many robots on a seeded random maze")
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--robots", type=int, default=200)
+    parser.add_argument("--density", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from pathfinding_engine import Grid, fill_random_walls
+    grid = fill_random_walls(Grid(args.size), args.density, args.seed)
+    results = plan_agents(grid, random_agents(grid, args.robots, args.seed))
+    print(json.dumps(summary(results)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""LRU cache of search results keyed on grid version and endpoints."""
+import sys
+from collections import OrderedDict
+
+from pathfinding_engine import search
+
+# Rough per-entry costs used for the memory bound
+_CELL_BYTES = sys.getsizeof((0, 0)) + 8  # tuple plus its slot in the path list
+_ENTRY_OVERHEAD = 400  # key tuple, stats object, OrderedDict node
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+class PathCache:
+    """Caches (path, stats) per (grid version, algorithm, start, goal).
+
+    Grid versions only ever grow, so as soon as the grid changes every
+    stored entry is unreachable and the cache drops them all at once.
+    Within one version, least recently used entries are evicted once the
+    estimated size passes ``max_bytes``.
+    """
+
+    def __init__(self, grid, max_bytes=DEFAULT_MAX_BYTES):
+        self.grid = grid
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def search(self, start, goal, algorithm="A*", log=None, stats=None):
+        """Same contract as pathfinding_engine.search, served from cache when possible.
+
+        Only searches that actually run are written to ``log``, and
+        cancelled searches are never stored.
+        """
+        version = self.grid.version
+        if self.entries and next(iter(self.entries))[0] != version:
+            self.clear()
+        key = (version, algorithm, start, goal)
+        result = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = search(self.grid, start, goal, algorithm, log=log, stats=stats)
+        if not result[1].cancelled:
+            self._store(key, result)
+        return result
+
+    def _store(self, key, result):
+        cost = self._entry_size(result)
+        if cost > self.max_bytes:
+            return
+        self.entries[key] = result
+        self.size += cost
+        while self.size > self.max_bytes:
+            _, old = self.entries.popitem(last=False)
+            self.size -= self._entry_size(old)
+            self.evictions += 1
+
+    @staticmethod
+    def _entry_size(result):
+        path, stats = result
+        # The stats keep the expansion order alive along with the path
+        size = _ENTRY_OVERHEAD + len(stats.expansion_order) * _CELL_BYTES
+        return size + (len(path) * _CELL_BYTES if path else 0)
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def info(self):
+        """Counters for checking whether the cache pays off"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,728 @@
+"""Headless pathfinding engine for the Robo Path Finding Game.
+
+Nothing in this module imports tkinter, so searches can run on machines
+without a display and on grids much larger than the game board.
+"""
+import heapq
+import json
+import random
+import time
+from collections import deque
+
+FREE = 0
+WALL = 1
+
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Terrain costs: entering a cell costs 1 (plain floor) up to MAX_COST
+MIN_COST = 1
+MAX_COST = 9
+
+# Number of single-cell edits kept for incremental consumers of a Grid
+JOURNAL_LIMIT = 10000
+
+# Wall density for each difficulty level of the game
+DIFFICULTY_DENSITY = {"Easy": 0.2, "Medium": 0.3, "Hard": 0.4, "Expert": 0.5}
+
+
+class Grid:
+    """Rectangular 4-connected grid sized at runtime (0 = free, 1 = wall).
+
+    Free cells may also carry a terrain cost, the price of stepping onto
+    them. ``costs`` stays None (every step costs 1) until the first
+    ``set_cost``, then holds one byte per cell.
+
+    Every change made through the methods below bumps ``version`` and is
+    written to a short journal, so incremental planners can ask which cells
+    changed since they last looked. Code that writes ``cells`` directly must
+    call ``mark_changed()`` afterwards. Those planners and indexes are kept
+    on the grid itself (see ``attached``) and go away with it.
+    """
+
+    def __init__(self, rows, cols=None, cells=None):
+        if cols is None:
+            cols = rows
+        if rows <= 0 or cols <= 0:
+            raise ValueError("Grid dimensions must be positive")
+        self.rows = rows
+        self.cols = cols
+        if cells is None:
+            cells = bytearray(rows * cols)
+        else:
+            # Use an existing buffer (e.g. shared memory) without copying it
+            cells = memoryview(cells).cast("B")
+            if len(cells) != rows * cols:
+                raise ValueError("Cell buffer does not match the grid dimensions")
+        self.cells = cells
+        self.costs = None
+        self.version = 0
+        self._journal = []
+        self._journal_start = 0
+        self._attached = {}
+
+    @classmethod
+    def from_rows(cls, grid_map):
+        """Build a grid from a list of lists of 0/1 values"""
+        grid = cls(len(grid_map), len(grid_map[0]))
+        for r, row in enumerate(grid_map):
+            if len(row) != grid.cols:
+                raise ValueError("All rows must have the same length")
+            for c, value in enumerate(row):
+                if value:
+                    grid.cells[r * grid.cols + c] = WALL
+        return grid
+
+    def to_rows(self):
+        """Return the grid as a list of lists of 0/1 values"""
+        cols = self.cols
+        return [list(self.cells[r * cols:(r + 1) * cols]) for r in range(self.rows)]
+
+    def copy(self):
+        grid = Grid(self.rows, self.cols)
+        grid.cells[:] = self.cells
+        if self.costs is not None:
+            grid.costs = bytearray(self.costs)
+        return grid
+
+    def in_bounds(self, state):
+        r, c = state
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def is_wall(self, state):
+        r, c = state
+        return self.cells[r * self.cols + c] == WALL
+
+    def set_wall(self, state, wall=True):
+        r, c = state
+        value = WALL if wall else FREE
+        index = r * self.cols + c
+        if self.cells[index] == value:
+            return
+        self.cells[index] = value
+        self._record(state)
+
+    def cost(self, state):
+        """Cost of stepping onto ``state``"""
+        if self.costs is None:
+            return MIN_COST
+        r, c = state
+        return self.costs[r * self.cols + c]
+
+    def set_cost(self, state, cost):
+        if not MIN_COST <= cost <= MAX_COST:
+            raise ValueError(f"Terrain cost must be between {MIN_COST} and {MAX_COST}")
+        if self.costs is None:
+            if cost == MIN_COST:
+                return
+            self.costs = bytearray([MIN_COST]) * len(self.cells)
+        r, c = state
+        index = r * self.cols + c
+        if self.costs[index] == cost:
+            return
+        self.costs[index] = cost
+        self._record(state)
+
+    def clear_costs(self):
+        """Make every cell plain floor again"""
+        if self.costs is not None:
+            self.costs = None
+            self.mark_changed()
+
+    def _record(self, state):
+        self.version += 1
+        self._journal.append(state)
+        if len(self._journal) > JOURNAL_LIMIT:
+            del self._journal[:JOURNAL_LIMIT // 2]
+            self._journal_start = self.version - len(self._journal)
+
+    def toggle_wall(self, state):
+        """Flip a cell between free and wall, returning True if it is now a wall"""
+        wall = not self.is_wall(state)
+        self.set_wall(state, wall)
+        return wall
+
+    def clear(self):
+        """Remove all walls"""
+        walls = [i for i, value in enumerate(self.cells) if value == WALL]
+        if len(walls) > JOURNAL_LIMIT:
+            self.cells[:] = bytes(len(self.cells))
+            self.mark_changed()
+            return
+        for index in walls:
+            self.set_wall(divmod(index, self.cols), False)
+
+    def mark_changed(self):
+        """Record a bulk change; incremental consumers will rebuild from scratch"""
+        self.version += 1
+        self._journal = []
+        self._journal_start = self.version
+
+    def changes_since(self, version):
+        """Cells edited after ``version``, or None if the journal can't tell"""
+        if version < self._journal_start or version > self.version:
+            return None
+        return self._journal[version - self._journal_start:]
+
+    def attached(self, key, factory, sync=True):
+        """Return the helper kept under ``key``, building it with ``factory(grid)`` on first use.
+
+        Helpers are the incremental consumers of the journal: they have a
+        ``version`` and a ``sync()`` that applies the edits made since. A
+        kept helper is synced before it is returned, so it always matches
+        the grid; ``sync=False`` leaves that to callers that have to sync at
+        a particular moment (under a lock, or after moving the start).
+        """
+        helper = self._attached.get(key)
+        if helper is None:
+            helper = self._attached[key] = factory(self)
+        elif sync and helper.version != self.version:
+            helper.sync()
+        return helper
+
+    def neighbors(self, state):
+        """Get free 4-connected neighbors"""
+        r, c = state
+        rows, cols, cells = self.rows, self.cols, self.cells
+        neighbors = []
+        for dr, dc in DIRECTIONS:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols and cells[nr * cols + nc] == FREE:
+                neighbors.append((nr, nc))
+        return neighbors
+
+
+def fill_random_walls(grid, density, seed=None, keep_free=()):
+    """Replace the grid's walls with random ones; the same seed gives the same maze"""
+    rng = random.Random(seed)
+    grid.cells[:] = bytes(WALL if rng.random() < density else FREE for _ in range(len(grid.cells)))
+    for state in keep_free:
+        if state is not None:
+            grid.cells[state[0] * grid.cols + state[1]] = FREE
+    grid.mark_changed()
+    return grid
+
+
+def fill_random_costs(grid, max_cost=MAX_COST, seed=None):
+    """Give every cell a random terrain cost from 1 to ``max_cost``"""
+    if not MIN_COST <= max_cost <= MAX_COST:
+        raise ValueError(f"Terrain cost must be between {MIN_COST} and {MAX_COST}")
+    rng = random.Random(seed)
+    grid.costs = bytearray(rng.randint(MIN_COST, max_cost) for _ in range(len(grid.cells)))
+    grid.mark_changed()
+    return grid
+
+
+def path_cost(grid, path):
+    """Total terrain cost of walking ``path`` (the start cell is free)"""
+    return sum(grid.cost(state) for state in path[1:])
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search when its cancel event is set"""
+
+
+class _CancellableOrder(list):
+    """Expansion-order list that aborts the search once ``cancel`` is set.
+
+    Every algorithm appends each expanded cell, so this gives all of them a
+    cancellation point without touching their loops. Another thread may
+    read the list while it grows to show progress.
+    """
+
+    def __init__(self, cancel):
+        super().__init__()
+        self.cancel = cancel
+
+    def append(self, state):
+        if self.cancel.is_set():
+            raise SearchCancelled()
+        super().append(state)
+
+
+class _ExpansionCounter:
+    """Stands in for the expansion-order list when the order isn't wanted"""
+
+    def __init__(self):
+        self.count = 0
+
+    def append(self, state):
+        self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(())
+
+
+class SearchStats:
+    """Record filled in by an algorithm while it searches.
+
+    Algorithms append every expanded cell to ``expansion_order``, bump
+    ``pushes`` for every queue/heap insertion and keep ``peak_frontier`` up
+    to date; ``search`` fills in the query, the wall time and the totals.
+    Algorithms may attach extra counters of their own, e.g. the
+    bidirectional searches record forward_expanded and backward_expanded.
+    """
+
+    def __init__(self, algorithm, record_order=True, cancel=None):
+        self.algorithm = algorithm
+        self.start = None
+        self.goal = None
+        self.path_length = None
+        self.path_cost = None
+        self.wall_time = 0.0
+        self.nodes_expanded = 0
+        self.pushes = 0
+        self.peak_frontier = 0
+        self.cancelled = False
+        if cancel is not None:
+            self.expansion_order = _CancellableOrder(cancel)
+        elif record_order:
+            self.expansion_order = []
+        else:
+            self.expansion_order = _ExpansionCounter()
+
+    def as_dict(self, include_order=True):
+        record = dict(vars(self))
+        if include_order:
+            record["expansion_order"] = list(self.expansion_order)
+        else:
+            del record["expansion_order"]
+        return record
+
+
+class SearchLog:
+    """Appends one JSON line per search for offline analysis"""
+
+    def __init__(self, path, include_order=False):
+        self.path = path
+        self.include_order = include_order
+
+    def write(self, stats):
+        record = stats.as_dict(self.include_order)
+        record["timestamp"] = time.time()
+        with open(self.path, "a") as log:
+            log.write(json.dumps(record) + "\n")
+
+
+# Algorithm registry: name -> function(grid, start, goal, stats) returning a path or None
+ALGORITHMS = {}
+
+# Algorithms that honor terrain costs; the rest treat every step as cost 1
+WEIGHTED_ALGORITHMS = set()
+
+
+def register(name, weighted=False):
+    """Decorator adding a search function to the algorithm registry"""
+    def decorator(func):
+        ALGORITHMS[name] = func
+        if weighted:
+            WEIGHTED_ALGORITHMS.add(name)
+        return func
+    return decorator
+
+
+def algorithm_names():
+    return list(ALGORITHMS)
+
+
+def search(grid, start, goal, algorithm="A*", record_order=True, log=None, stats=None):
+    """Run a registered algorithm and return (path, stats).
+
+    Pass ``record_order=False`` to keep only the expansion count (cheaper
+    for bulk queries), and a SearchLog as ``log`` to append the record to
+    a JSONL file. A caller that wants to watch or cancel the search from
+    another thread passes its own ``SearchStats(algorithm, cancel=event)``;
+    a cancelled search returns no path and sets ``stats.cancelled``.
+    """
+    try:
+        func = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {algorithm}") from None
+    for state in (start, goal):
+        if not grid.in_bounds(state):
+            raise ValueError(f"Cell {state} is outside the grid")
+    if stats is None:
+        stats = SearchStats(algorithm, record_order)
+    stats.start, stats.goal = start, goal
+    path = None
+    began = time.perf_counter()
+    if not grid.is_wall(start) and not grid.is_wall(goal):
+        try:
+            path = func(grid, start, goal, stats)
+        except SearchCancelled:
+            stats.cancelled = True
+    stats.wall_time = time.perf_counter() - began
+    stats.nodes_expanded += len(stats.expansion_order)
+    stats.path_length = len(path) if path else None
+    stats.path_cost = path_cost(grid, path) if path else None
+    if log is not None:
+        log.write(stats)
+    return path, stats
+
+
+def find_path(grid, start, goal, algorithm="A*"):
+    """Convenience wrapper returning only the path"""
+    return search(grid, start, goal, algorithm)[0]
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def _reconstruct(came_from, current):
+    path = [current]
+    while came_from[current] is not None:
+        current = came_from[current]
+        path.append(current)
+    return path[::-1]
+
+
+@register("A*", weighted=True)
+def astar_search(grid, start, goal, stats):
+    open_set = [(manhattan(start, goal), 0, start, None)]
+    stats.pushes += 1
+    came_from = {}
+    cost_so_far = {start: 0}
+    expanded = stats.expansion_order
+    costs, cols = grid.costs, grid.cols
+
+    while open_set:
+        if len(open_set) > stats.peak_frontier:
+            stats.peak_frontier = len(open_set)
+        _, g, current, parent = heapq.heappop(open_set)
+        if current in came_from:
+            continue
+        came_from[current] = parent
+        if current == goal:
+            return _reconstruct(came_from, current)
+        expanded.append(current)
+        for neighbor in grid.neighbors(current):
+            new_cost = g + (1 if costs is None else costs[neighbor[0] * cols + neighbor[1]])
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                priority = new_cost + manhattan(neighbor, goal)
+                heapq.heappush(open_set, (priority, new_cost, neighbor, current))
+                stats.pushes += 1
+    return None
+
+
+@register("Dijkstra", weighted=True)
+def dijkstra_search(grid, start, goal, stats):
+    queue = [(0, start, None)]
+    stats.pushes += 1
+    distances = {start: 0}
+    came_from = {}
+    expanded = stats.expansion_order
+    costs, cols = grid.costs, grid.cols
+
+    while queue:
+        if len(queue) > stats.peak_frontier:
+            stats.peak_frontier = len(queue)
+        dist, current, parent = heapq.heappop(queue)
+        if current in came_from:
+            continue
+        came_from[current] = parent
+        if current == goal:
+            return _reconstruct(came_from, current)
+        expanded.append(current)
+        for neighbor in grid.neighbors(current):
+            new_dist = dist + (1 if costs is None else costs[neighbor[0] * cols + neighbor[1]])
+            if neighbor not in distances or new_dist < distances[neighbor]:
+                distances[neighbor] = new_dist
+                heapq.heappush(queue, (new_dist, neighbor, current))
+                stats.pushes += 1
+    return None
+
+
+@register("Dijkstra (Dial)", weighted=True)
+def dial_search(grid, start, goal, stats):
+    """Dijkstra with a circular bucket queue (Dial's algorithm).
+
+    Step costs are small integers, so every pending distance lies within
+    MAX_COST of the current one and MAX_COST + 1 buckets hold the whole
+    frontier. Pops and pushes are list operations instead of heap sifts.
+    """
+    bucket_count = MAX_COST + 1
+    buckets = [[] for _ in range(bucket_count)]
+    buckets[0].append((start, None))
+    stats.pushes += 1
+    pending = 1
+    distances = {start: 0}
+    came_from = {}
+    expanded = stats.expansion_order
+    costs, cols = grid.costs, grid.cols
+    dist = 0
+
+    while pending:
+        if pending > stats.peak_frontier:
+            stats.peak_frontier = pending
+        bucket = buckets[dist % bucket_count]
+        while not bucket:
+            dist += 1
+            bucket = buckets[dist % bucket_count]
+        current, parent = bucket.pop()
+        pending -= 1
+        # Entries left behind by a later improvement are skipped here
+        if current in came_from:
+            continue
+        came_from[current] = parent
+        if current == goal:
+            return _reconstruct(came_from, current)
+        expanded.append(current)
+        for neighbor in grid.neighbors(current):
+            new_dist = dist + (1 if costs is None else costs[neighbor[0] * cols + neighbor[1]])
+            if neighbor not in distances or new_dist < distances[neighbor]:
+                distances[neighbor] = new_dist
+                buckets[new_dist % bucket_count].append((neighbor, current))
+                pending += 1
+                stats.pushes += 1
+    return None
+
+
+@register("BFS")
+def bfs_search(grid, start, goal, stats):
+    queue = deque([start])
+    stats.pushes += 1
+    came_from = {start: None}
+    expanded = stats.expansion_order
+
+    while queue:
+        if len(queue) > stats.peak_frontier:
+            stats.peak_frontier = len(queue)
+        current = queue.popleft()
+        if current == goal:
+            return _reconstruct(came_from, current)
+        expanded.append(current)
+        for neighbor in grid.neighbors(current):
+            if neighbor not in came_from:
+                came_from[neighbor] = current
+                queue.append(neighbor)
+                stats.pushes += 1
+    return None
+
+
+@register("DFS")
+def dfs_search(grid, start, goal, stats):
+    stack = [(start, None)]
+    stats.pushes += 1
+    came_from = {}
+    expanded = stats.expansion_order
+
+    while stack:
+        if len(stack) > stats.peak_frontier:
+            stats.peak_frontier = len(stack)
+        current, parent = stack.pop()
+        if current in came_from:
+            continue
+        came_from[current] = parent
+        if current == goal:
+            return _reconstruct(came_from, current)
+        expanded.append(current)
+        for neighbor in grid.neighbors(current):
+            if neighbor not in came_from:
+                stack.append((neighbor, current))
+                stats.pushes += 1
+    return None
+
+
+def _sign(x):
+    return (x > 0) - (x < 0)
+
+
+def _jump_horizontal(grid, r, c, dc, goal):
+    """Step along a row until a jump point, a wall or the grid edge"""
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    while True:
+        c += dc
+        if not 0 <= c < cols or cells[r * cols + c] == WALL:
+            return None
+        if (r, c) == goal:
+            return (r, c)
+        # Forced neighbor: the cell above/below opens up right after a wall
+        if r > 0 and cells[(r - 1) * cols + c] == FREE and cells[(r - 1) * cols + c - dc] == WALL:
+            return (r, c)
+        if r + 1 < rows and cells[(r + 1) * cols + c] == FREE and cells[(r + 1) * cols + c - dc] == WALL:
+            return (r, c)
+
+
+def _jump_vertical(grid, r, c, dr, goal):
+    """Step along a column, stopping wherever a horizontal jump would succeed"""
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    while True:
+        r += dr
+        if not 0 <= r < rows or cells[r * cols + c] == WALL:
+            return None
+        if (r, c) == goal:
+            return (r, c)
+        if c > 0 and cells[r * cols + c - 1] == FREE and cells[(r - dr) * cols + c - 1] == WALL:
+            return (r, c)
+        if c + 1 < cols and cells[r * cols + c + 1] == FREE and cells[(r - dr) * cols + c + 1] == WALL:
+            return (r, c)
+        if _jump_horizontal(grid, r, c, 1, goal) or _jump_horizontal(grid, r, c, -1, goal):
+            return (r, c)
+
+
+def _jps_directions(current, parent):
+    """Pruned directions for the 4-connected canonical ordering (vertical first)"""
+    if parent is None:
+        return DIRECTIONS
+    dr, dc = _sign(current[0] - parent[0]), _sign(current[1] - parent[1])
+    if dc:
+        return [(0, dc), (-1, 0), (1, 0)]
+    return [(dr, 0), (0, -1), (0, 1)]
+
+
+@register("JPS")
+def jps_search(grid, start, goal, stats):
+    """Jump Point Search for uniform-cost 4-connected grids.
+
+    Only jump points go on the heap; the straight runs between them are
+    scanned without heap traffic and filled back in when the path is built.
+    """
+    open_set = [(manhattan(start, goal), 0, start, None)]
+    stats.pushes += 1
+    came_from = {}
+    cost_so_far = {start: 0}
+    expanded = stats.expansion_order
+
+    while open_set:
+        if len(open_set) > stats.peak_frontier:
+            stats.peak_frontier = len(open_set)
+        _, g, current, parent = heapq.heappop(open_set)
+        if current in came_from:
+            continue
+        came_from[current] = parent
+        if current == goal:
+            return _expand_jumps(_reconstruct(came_from, current))
+        expanded.append(current)
+        r, c = current
+        for dr, dc in _jps_directions(current, parent):
+            if dc:
+                jump_point = _jump_horizontal(grid, r, c, dc, goal)
+            else:
+                jump_point = _jump_vertical(grid, r, c, dr, goal)
+            if jump_point is None:
+                continue
+            new_cost = g + manhattan(current, jump_point)
+            if jump_point not in cost_so_far or new_cost < cost_so_far[jump_point]:
+                cost_so_far[jump_point] = new_cost
+                priority = new_cost + manhattan(jump_point, goal)
+                heapq.heappush(open_set, (priority, new_cost, jump_point, current))
+                stats.pushes += 1
+    return None
+
+
+def _expand_jumps(jump_points):
+    """Fill in the straight cell runs between consecutive jump points"""
+    path = [jump_points[0]]
+    for (r2, c2) in jump_points[1:]:
+        r, c = path[-1]
+        dr, dc = _sign(r2 - r), _sign(c2 - c)
+        while (r, c) != (r2, c2):
+            r, c = r + dr, c + dc
+            path.append((r, c))
+    return path
+
+
+def _join_halves(forward_parents, backward_parents, meet):
+    """Stitch start->meet and meet->goal parent chains into one path"""
+    path = _reconstruct(forward_parents, meet)
+    current = backward_parents[meet]
+    while current is not None:
+        path.append(current)
+        current = backward_parents[current]
+    return path
+
+
+@register("Bi-BFS")
+def bidirectional_bfs_search(grid, start, goal, stats):
+    """BFS from both ends, always growing the smaller frontier by one full layer"""
+    parents = ({start: None}, {goal: None})
+    depths = ({start: 0}, {goal: 0})
+    frontiers = ([start], [goal])
+    side_expanded = [0, 0]
+    order = stats.expansion_order
+    stats.pushes += 2
+    best, meet = (0, start) if start == goal else (None, None)
+
+    while meet is None and frontiers[0] and frontiers[1]:
+        stats.peak_frontier = max(stats.peak_frontier, len(frontiers[0]) + len(frontiers[1]))
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own_parents, own_depths = parents[side], depths[side]
+        other_depths = depths[1 - side]
+        next_frontier = []
+        for current in frontiers[side]:
+            side_expanded[side] += 1
+            order.append(current)
+            depth = own_depths[current] + 1
+            for neighbor in grid.neighbors(current):
+                if neighbor in own_depths:
+                    continue
+                own_parents[neighbor] = current
+                own_depths[neighbor] = depth
+                if neighbor in other_depths:
+                    # Finish the layer anyway: the shortest join may come later in it
+                    length = depth + other_depths[neighbor]
+                    if best is None or length < best:
+                        best, meet = length, neighbor
+                next_frontier.append(neighbor)
+                stats.pushes += 1
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+
+    stats.forward_expanded, stats.backward_expanded = side_expanded
+    if meet is None:
+        return None
+    return _join_halves(parents[0], parents[1], meet)
+
+
+@register("Bi-A*")
+def bidirectional_astar_search(grid, start, goal, stats):
+    """A* from both ends with the symmetric stopping rule.
+
+    Both searches use Manhattan distance to their own target. The search
+    stops once either queue's smallest f-value reaches the best join found
+    so far, which keeps the result optimal.
+    """
+    targets = (goal, start)
+    queues = ([(manhattan(start, goal), 0, start)], [(manhattan(goal, start), 0, goal)])
+    costs = ({start: 0}, {goal: 0})
+    parents = ({start: None}, {goal: None})
+    closed = (set(), set())
+    side_expanded = [0, 0]
+    order = stats.expansion_order
+    stats.pushes += 2
+    best, meet = (0, start) if start == goal else (float("inf"), None)
+
+    while True:
+        for side in (0, 1):
+            queue = queues[side]
+            while queue and (queue[0][2] in closed[side] or queue[0][1] > costs[side][queue[0][2]]):
+                heapq.heappop(queue)
+        if not queues[0] or not queues[1]:
+            break
+        if max(queues[0][0][0], queues[1][0][0]) >= best:
+            break
+        stats.peak_frontier = max(stats.peak_frontier, len(queues[0]) + len(queues[1]))
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        _, g, current = heapq.heappop(queues[side])
+        closed[side].add(current)
+        side_expanded[side] += 1
+        order.append(current)
+        own_costs, other_costs = costs[side], costs[1 - side]
+        for neighbor in grid.neighbors(current):
+            new_cost = g + 1
+            if neighbor not in own_costs or new_cost < own_costs[neighbor]:
+                own_costs[neighbor] = new_cost
+                parents[side][neighbor] = current
+                priority = new_cost + manhattan(neighbor, targets[side])
+                heapq.heappush(queues[side], (priority, new_cost, neighbor))
+                stats.pushes += 1
+                if neighbor in other_costs and new_cost + other_costs[neighbor] < best:
+                    best, meet = new_cost + other_costs[neighbor], neighbor
+
+    stats.forward_expanded, stats.backward_expanded = side_expanded
+    if meet is None:
+        return None
+    return _join_halves(parents[0], parents[1], meet)
@@ -1,25 +1,54 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import heapq
-import random
+from tkinter import ttk, messagebox, filedialog
 from PIL import Image, ImageTk
-import urllib.request
-from io import BytesIO
 import time
+import threading
+
+from pathfinding_engine import (DIFFICULTY_DENSITY, WEIGHTED_ALGORITHMS, Grid, SearchLog, SearchStats,
+                                algorithm_names, fill_random_costs)
+import dstar_lite  # registers the "D* Lite" incremental planner
+import distance_field  # registers the "Distance Field" lookup
+import hpa  # registers the "HPA*" hierarchical planner
+import flat_search  # registers "A* (flat)", "Dijkstra (flat)" and "BFS (flat)"
+from path_cache import PathCache
+from asset_cache import AssetCache
+from multi_agent import plan_agents, random_agents, summary
+import maze_gen
+from board_view import BoardView
+from animation import DEFAULT_SPEED, PathAnimation, interpolate
+from connectivity import index_for, unreachable_result
+from map_io import load_any, save_map
 
 GRID_SIZE = 20
 CELL_SIZE = 30
+BOARD_PIXELS = GRID_SIZE * CELL_SIZE  # loaded maps open zoomed to fit this
+PATH_OVAL_LIMIT = 400     # longer paths are drawn as one line instead of dots
+SEARCH_POLL_MS = 30       # how often a running search is checked
+SEARCH_DRAW_BATCH = 500   # explored cells drawn per poll
+MAX_ROBOT_SPEED = 200     # top of the speed slider, in steps per second
+MAX_ROBOTS = 60
+SPRITE_POLL_MS = 200      # how often a background sprite refresh is checked
+STARTUP_BUDGET_S = 0.5    # cold start to first idle loop, with sprites cached
+
+# Right-drag brushes: None toggles walls, a number paints that terrain cost
+TERRAIN_BRUSHES = {"Wall": None, "Floor (1)": 1, "Grass (3)": 3, "Mud (5)": 5, "Water (9)": 9}
+
+SPRITE_URLS = {
+    "robot": "https://agi-prod-file-upload-public-main-use1.s3.amazonaws.com/3b0d6b78-0ad8-47d5-92da-e97ef0fd7b41",
+    "flag": "https://agi-prod-file-upload-public-main-use1.s3.amazonaws.com/262c8807-ba90-47c0-99b6-d72bc47f52cf",
+}
 
 class RoboPathFindingApp(tk.Tk):
 
     def __init__(self):
+        self.launch_began = time.perf_counter()
         super().__init__()
         self.title("🤖 Robo Path Finding Game")
         self.geometry(f"{GRID_SIZE * CELL_SIZE + 250}x{GRID_SIZE * CELL_SIZE + 100}")
-        self.resizable(False, False)
 
         # Grid and state
-        self.grid_map = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.grid = Grid(GRID_SIZE, GRID_SIZE)
+        self.path_cache = PathCache(self.grid)
         self.start = None
         self.goal = None
         self.drawing = False
@@ -31,59 +60,96 @@ class RoboPathFindingApp(tk.Tk):
         self.best_score = 0
         self.start_time = None
         self.is_animating = False
+        self.animation = None
+        self.searching = False
         self.visited_cells = set()
+        self.search_log = SearchLog("search_log.jsonl")
 
         # Selected algorithm variable
         self.alg_choice = tk.StringVar(value="A*")
-
-        # Load images
+        self.log_searches = tk.BooleanVar(value=False)
+        self.robot_speed = tk.IntVar(value=DEFAULT_SPEED)
+        self.brush = tk.StringVar(value="Wall")
+        self.random_terrain = tk.BooleanVar(value=False)
+        self.maze_style = tk.StringVar(value="Random")
+        self.guarantee_path = tk.BooleanVar(value=True)
+
+        # Load images (local files only; the network is touched after the window shows)
+        self.asset_cache = AssetCache()
         self.load_images()
 
         # Setup UI
         self.create_widgets()
+        self.after_idle(self.report_startup)
+        self.after_idle(self.refresh_sprites)
 
     def load_images(self):
-        """Load robot and flag images"""
-        try:
-            # Robot image (skeleton character)
-            robot_url = "https://agi-prod-file-upload-public-main-use1.s3.amazonaws.com/3b0d6b78-0ad8-47d5-92da-e97ef0fd7b41"
-            with urllib.request.urlopen(robot_url) as url:
-                robot_data = url.read()
-            robot_img = Image.open(BytesIO(robot_data))
-            robot_img = robot_img.resize((CELL_SIZE-4, CELL_SIZE-4), Image.Resampling.LANCZOS)
-            self.robot_image = ImageTk.PhotoImage(robot_img)
-
-            # Flag image (finish flag)
-            flag_url = "https://agi-prod-file-upload-public-main-use1.s3.amazonaws.com/262c8807-ba90-47c0-99b6-d72bc47f52cf"
-            with urllib.request.urlopen(flag_url) as url:
-                flag_data = url.read()
-            flag_img = Image.open(BytesIO(flag_data))
-            flag_img = flag_img.resize((CELL_SIZE-4, CELL_SIZE-4), Image.Resampling.LANCZOS)
-            self.flag_image = ImageTk.PhotoImage(flag_img)
-            
-        except Exception as e:
-            print(f"Error loading images: {e}")
-            self.robot_image = None
-            self.flag_image = None
+        """Load robot and flag sprites from the local cache only.
+
+        Missing sprites fall back to emoji markers until refresh_sprites
+        has downloaded them in the background.
+        """
+        self.sprite_images = {}
+        for name, url in SPRITE_URLS.items():
+            try:
+                path = self.asset_cache.resized_path(url, CELL_SIZE - 4)
+                if path:
+                    self.sprite_images[name] = ImageTk.PhotoImage(Image.open(path))
+            except Exception as e:
+                print(f"Error loading {name} image: {e}")
+        self.robot_image = self.sprite_images.get("robot")
+        self.flag_image = self.sprite_images.get("flag")
+
+    def refresh_sprites(self):
+        """Download missing or stale sprites in a worker thread once the window is up"""
+        changed = []
+        thread = threading.Thread(target=lambda: changed.extend(self.asset_cache.refresh(SPRITE_URLS.values())),
+                                  daemon=True)
+        thread.start()
+        self.after(SPRITE_POLL_MS, self.poll_sprites, thread, changed)
+
+    def poll_sprites(self, thread, changed):
+        if thread.is_alive():
+            self.after(SPRITE_POLL_MS, self.poll_sprites, thread, changed)
+            return
+        if changed:
+            self.load_images()
+            for item in (self.robot_item, self.flag_item):
+                self.canvas.delete(item)
+            self.robot_item = self.create_marker(self.robot_image, "🤖")
+            self.flag_item = self.create_marker(self.flag_image, "🏁")
+            self.update_markers()
+
+    def report_startup(self):
+        """Measure the time from __init__ to the first idle event loop"""
+        self.startup_time = time.perf_counter() - self.launch_began
+        if self.startup_time > STARTUP_BUDGET_S:
+            print(f"Startup took {self.startup_time:.2f}s (budget {STARTUP_BUDGET_S:.2f}s)")
 
     def create_widgets(self):
         # Main container
         main_frame = tk.Frame(self, bg="#1a1a1a")
         main_frame.pack(fill=tk.BOTH, expand=True)
 
-        # Canvas for grid
-        self.canvas = tk.Canvas(main_frame, width=GRID_SIZE * CELL_SIZE, height=GRID_SIZE * CELL_SIZE, 
+        # Controls Frame (packed first so it keeps its width when the window shrinks)
+        control_frame = tk.Frame(main_frame, width=250, bg="#1a1a1a")
+        control_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=10, pady=10)
+
+        # Canvas for grid; it grows with the window and scrolls over large maps
+        self.canvas = tk.Canvas(main_frame, width=BOARD_PIXELS, height=BOARD_PIXELS, 
                                bg="#2a2a2a", highlightthickness=0)
-        self.canvas.pack(side=tk.LEFT, padx=10, pady=10)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
         self.canvas.bind("<Button-1>", self.on_left_click)
         self.canvas.bind("<Button-3>", self.on_right_click)
         self.canvas.bind("<B3-Motion>", self.on_right_drag)
         self.canvas.bind("<ButtonRelease-3>", self.on_button_release)
-        self.draw_grid()
-
-        # Controls Frame
-        control_frame = tk.Frame(main_frame, width=250, bg="#1a1a1a")
-        control_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=10, pady=10)
+        self.canvas.bind("<MouseWheel>", self.on_zoom)
+        self.canvas.bind("<Button-4>", self.on_zoom)
+        self.canvas.bind("<Button-5>", self.on_zoom)
+        self.canvas.bind("<ButtonPress-2>", self.on_pan_start)
+        self.canvas.bind("<B2-Motion>", self.on_pan)
+        self.canvas.bind("<Configure>", lambda event: self.board.show_visible())
+        self.build_grid()
 
         # Title
         title_label = tk.Label(control_frame, text="🤖 ROBO PATH", 
@@ -118,13 +184,21 @@ class RoboPathFindingApp(tk.Tk):
                                     font=("Arial", 10), bg="#2a2a2a", fg="#ffffff")
         self.timer_label.pack(pady=5)
 
+        # Last search
+        self.search_label = tk.Label(stats_frame, text="SEARCH: -", 
+                                     font=("Arial", 9), bg="#2a2a2a", fg="#aaaaaa")
+        self.search_label.pack(pady=5)
+
         # Algorithm selection
         tk.Label(control_frame, text="⚙️ Algorithm:", bg="#1a1a1a", fg="#ffffff",
                 font=("Arial", 10, "bold")).pack(pady=(10, 5))
         alg_menu = ttk.Combobox(control_frame, textvariable=self.alg_choice, 
-                                values=["A*", "Dijkstra", "BFS", "DFS"], 
+                                values=algorithm_names(), 
                                 state="readonly", width=15, font=("Arial", 10))
         alg_menu.pack()
+        tk.Checkbutton(control_frame, text="📝 Log searches (JSONL)", variable=self.log_searches,
+                       bg="#1a1a1a", fg="#aaaaaa", selectcolor="#2a2a2a", activebackground="#1a1a1a",
+                       font=("Arial", 8)).pack()
 
         # Difficulty selector
         tk.Label(control_frame, text="🎯 Difficulty:", bg="#1a1a1a", fg="#ffffff",
@@ -134,6 +208,28 @@ class RoboPathFindingApp(tk.Tk):
                                       values=["Easy", "Medium", "Hard", "Expert"], 
                                       state="readonly", width=15, font=("Arial", 10))
         difficulty_menu.pack()
+        tk.Checkbutton(control_frame, text="⛰️ Random terrain costs", variable=self.random_terrain,
+                       bg="#1a1a1a", fg="#aaaaaa", selectcolor="#2a2a2a", activebackground="#1a1a1a",
+                       font=("Arial", 8)).pack()
+
+        # Maze style
+        tk.Label(control_frame, text="🧩 Maze style:", bg="#1a1a1a", fg="#ffffff",
+                font=("Arial", 10, "bold")).pack(pady=(10, 5))
+        style_menu = ttk.Combobox(control_frame, textvariable=self.maze_style,
+                                  values=list(maze_gen.STYLES),
+                                  state="readonly", width=15, font=("Arial", 10))
+        style_menu.pack()
+        tk.Checkbutton(control_frame, text="🔗 Robot can always reach flag", variable=self.guarantee_path,
+                       bg="#1a1a1a", fg="#aaaaaa", selectcolor="#2a2a2a", activebackground="#1a1a1a",
+                       font=("Arial", 8)).pack()
+
+        # Right-drag brush
+        tk.Label(control_frame, text="🖌️ Brush:", bg="#1a1a1a", fg="#ffffff",
+                font=("Arial", 10, "bold")).pack(pady=(10, 5))
+        brush_menu = ttk.Combobox(control_frame, textvariable=self.brush,
+                                  values=list(TERRAIN_BRUSHES),
+                                  state="readonly", width=15, font=("Arial", 10))
+        brush_menu.pack()
 
         # Buttons
         button_style = {"font": ("Arial", 10, "bold"), "width": 18, "height": 1, "relief": tk.FLAT, "cursor": "hand2"}
@@ -144,9 +240,31 @@ class RoboPathFindingApp(tk.Tk):
         self.run_button.pack(pady=10)
 
         # Animate button
-        animate_button = tk.Button(control_frame, text="🎬 ANIMATE PATH", command=self.animate_path, 
+        self.animate_button = tk.Button(control_frame, text="🎬 ANIMATE PATH", command=self.animate_path, 
                                   bg="#9c27b0", fg="white", activebackground="#7b1fa2", **button_style)
-        animate_button.pack(pady=5)
+        self.animate_button.pack(pady=5)
+
+        # Animation speed, pause and skip
+        tk.Scale(control_frame, from_=1, to=MAX_ROBOT_SPEED, orient=tk.HORIZONTAL, variable=self.robot_speed,
+                 command=self.on_speed_change, label="🐢 Speed (steps/s) 🐇", length=160,
+                 bg="#1a1a1a", fg="#aaaaaa", troughcolor="#2a2a2a", highlightthickness=0,
+                 font=("Arial", 8)).pack()
+        playback_frame = tk.Frame(control_frame, bg="#1a1a1a")
+        playback_frame.pack(pady=5)
+        self.pause_button = tk.Button(playback_frame, text="⏸ PAUSE", command=self.pause_animation,
+                                      bg="#607D8B", fg="white", activebackground="#455A64",
+                                      state=tk.DISABLED, **dict(button_style, width=8))
+        self.pause_button.pack(side=tk.LEFT, padx=(0, 4))
+        self.skip_button = tk.Button(playback_frame, text="⏭ SKIP", command=self.skip_animation,
+                                     bg="#607D8B", fg="white", activebackground="#455A64",
+                                     state=tk.DISABLED, **dict(button_style, width=8))
+        self.skip_button.pack(side=tk.LEFT)
+
+        # Cancel a running search
+        self.cancel_button = tk.Button(control_frame, text="⛔ CANCEL SEARCH", command=self.cancel_search,
+                                       bg="#607D8B", fg="white", activebackground="#455A64",
+                                       state=tk.DISABLED, **button_style)
+        self.cancel_button.pack(pady=5)
 
         # Generate Maze
         maze_button = tk.Button(control_frame, text="🎲 RANDOM MAZE", 
@@ -154,6 +272,25 @@ class RoboPathFindingApp(tk.Tk):
                                activebackground="#1976D2", **button_style)
         maze_button.pack(pady=5)
 
+        # Multi-robot mode
+        multi_frame = tk.Frame(control_frame, bg="#1a1a1a")
+        multi_frame.pack(pady=5)
+        self.robot_count = tk.IntVar(value=8)
+        tk.Spinbox(multi_frame, from_=2, to=MAX_ROBOTS, textvariable=self.robot_count, width=3,
+                   font=("Arial", 10)).pack(side=tk.LEFT, padx=(0, 5))
+        self.multi_button = tk.Button(multi_frame, text="👥 MULTI-ROBOT", command=self.run_multi_robot,
+                                      bg="#795548", fg="white", activebackground="#5D4037",
+                                      **dict(button_style, width=13))
+        self.multi_button.pack(side=tk.LEFT)
+
+        # Save / load maps
+        file_frame = tk.Frame(control_frame, bg="#1a1a1a")
+        file_frame.pack(pady=5)
+        tk.Button(file_frame, text="💾 SAVE", command=self.save_map_file, bg="#455A64", fg="white",
+                  activebackground="#37474F", **dict(button_style, width=8)).pack(side=tk.LEFT, padx=(0, 4))
+        tk.Button(file_frame, text="📂 LOAD", command=self.load_map_file, bg="#455A64", fg="white",
+                  activebackground="#37474F", **dict(button_style, width=8)).pack(side=tk.LEFT)
+
         # Next Level
         next_level_button = tk.Button(control_frame, text="⬆️ NEXT LEVEL", 
                                      command=self.next_level, bg="#4CAF50", fg="white",
@@ -176,52 +313,71 @@ class RoboPathFindingApp(tk.Tk):
                                text="\n📍 CONTROLS:\n"
                                     "• Left click: Robot & Flag\n"
                                     "• Right drag: Draw walls\n"
+                                    "• Wheel: Zoom | Middle drag: Pan\n"
                                     "• 🤖 Start | 🏁 Goal\n"
                                     "• Shorter path = Higher score!",
                                bg="#1a1a1a", fg="#aaaaaa", justify=tk.LEFT, font=("Arial", 8))
         instructions.pack(pady=15)
 
-    def draw_grid(self):
+    def build_grid(self, cell_size=CELL_SIZE):
+        """Show the current grid as raster tiles, with the markers on top"""
         self.canvas.delete("all")
-        for i in range(GRID_SIZE):
-            for j in range(GRID_SIZE):
-                x1, y1 = j * CELL_SIZE, i * CELL_SIZE
-                x2, y2 = x1 + CELL_SIZE, y1 + CELL_SIZE
-                
-                # Visited cells during pathfinding
-                if (i, j) in self.visited_cells:
-                    color = "#404040"
-                elif self.grid_map[i][j] == 1:
-                    color = "#1a1a1a"  # wall
-                elif self.start == (i, j):
-                    color = "#2d5016"  # dark green for robot
-                elif self.goal == (i, j):
-                    color = "#4a1a1a"  # dark red for flag
-                else:
-                    color = "#2a2a2a"
-                
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="#3a3a3a", width=1)
-                
-                # Draw images or emojis
-                if self.start == (i, j):
-                    if self.robot_image:
-                        self.canvas.create_image(x1+2, y1+2, anchor=tk.NW, image=self.robot_image)
-                    else:
-                        self.canvas.create_text(x1+CELL_SIZE//2, y1+CELL_SIZE//2, text="🤖", font=("Arial", 16))
-                elif self.goal == (i, j):
-                    if self.flag_image:
-                        self.canvas.create_image(x1+2, y1+2, anchor=tk.NW, image=self.flag_image)
-                    else:
-                        self.canvas.create_text(x1+CELL_SIZE//2, y1+CELL_SIZE//2, text="🏁", font=("Arial", 16))
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self.board = BoardView(self.canvas, self.grid, cell_size)
+
+        # Robot and flag are single items that get moved around
+        self.robot_item = self.create_marker(self.robot_image, "🤖")
+        self.flag_item = self.create_marker(self.flag_image, "🏁")
+        self.update_markers()
+
+    def create_marker(self, image, emoji):
+        if image:
+            return self.canvas.create_image(0, 0, image=image, state=tk.HIDDEN, tags="marker")
+        return self.canvas.create_text(0, 0, text=emoji, font=("Arial", 16), state=tk.HIDDEN, tags="marker")
+
+    def draw_cells(self, cells):
+        """Repaint only the tiles holding the given cells"""
+        self.board.start, self.board.goal = self.start, self.goal
+        self.board.refresh(cells)
+
+    def draw_grid(self):
+        """Repaint the whole board, used after bulk changes like a new maze"""
+        self.clear_path()
+        self.clear_agents()
+        board = self.board
+        board.start, board.goal = self.start, self.goal
+        board.visited[:] = False
+        board.mark_visited(self.visited_cells)
+        board.redraw()
+        self.update_markers()
+
+    def update_markers(self):
+        """Move the robot and flag items onto their cells"""
+        for item, cell in ((self.robot_item, self.start), (self.flag_item, self.goal)):
+            if cell is None:
+                self.canvas.itemconfig(item, state=tk.HIDDEN)
+            else:
+                self.canvas.coords(item, *self.cell_center(cell))
+                self.canvas.itemconfig(item, state=tk.NORMAL)
+        self.canvas.tag_raise("marker")
+
+    def clear_path(self):
+        self.canvas.delete("path")
+
+    def clear_visited(self):
+        visited, self.visited_cells = self.visited_cells, set()
+        self.board.mark_visited(visited, False)
+        self.draw_cells(visited)
 
     def on_left_click(self, event):
-        if self.is_animating:
+        if self.is_busy():
             return
-        col = event.x // CELL_SIZE
-        row = event.y // CELL_SIZE
-        if row >= GRID_SIZE or col >= GRID_SIZE:
+        cell = self.board.cell_at(event.x, event.y)
+        if cell is None:
             return
-        if self.grid_map[row][col] == 1:
+        row, col = cell
+        if self.grid.is_wall((row, col)):
             messagebox.showwarning("⚠️ Warning", "Cannot place on a wall!")
             return
         if not self.start:
@@ -231,85 +387,141 @@ class RoboPathFindingApp(tk.Tk):
             self.goal = (row, col)
         else:
             messagebox.showinfo("ℹ️ Info", "Robot and flag are set!")
-        self.draw_grid()
+            return
+        self.draw_cells([(row, col)])
+        self.update_markers()
 
     def on_right_click(self, event):
-        if self.is_animating:
+        if self.is_busy():
             return
         self.drawing = True
         self.toggle_wall(event)
 
     def on_right_drag(self, event):
-        if self.drawing and not self.is_animating:
+        if self.drawing and not self.is_busy():
             self.toggle_wall(event)
 
     def on_button_release(self, event):
         self.drawing = False
 
     def toggle_wall(self, event):
-        col = event.x // CELL_SIZE
-        row = event.y // CELL_SIZE
-        if row >= GRID_SIZE or col >= GRID_SIZE or row < 0 or col < 0:
+        cell = self.board.cell_at(event.x, event.y)
+        if cell is None:
             return
+        row, col = cell
         if (row, col) == self.start or (row, col) == self.goal:
             return
-        self.grid_map[row][col] = 1 if self.grid_map[row][col] == 0 else 0
+        cost = TERRAIN_BRUSHES.get(self.brush.get())
+        if cost is None:
+            self.grid.toggle_wall((row, col))
+        else:
+            self.grid.set_wall((row, col), False)
+            self.grid.set_cost((row, col), cost)
+        self.clear_path()
+        self.draw_cells([(row, col)])
+
+    def on_zoom(self, event):
+        """Zoom in or out around the mouse pointer"""
+        steps = 1 if event.num == 4 or event.delta > 0 else -1
+        factor = self.board.zoom(steps, event.x, event.y)
+        if factor:
+            self.canvas.scale("overlay", 0, 0, factor, factor)
+            self.update_markers()
+
+    def on_pan_start(self, event):
+        self.canvas.scan_mark(event.x, event.y)
+
+    def on_pan(self, event):
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self.board.show_visible()
+
+    def generate_random_maze(self, seed=None):
+        """Generate a maze in the selected style (pass a seed to reproduce a board).
+
+        Difficulty sets the wall density of "Random" mazes. With the
+        guarantee box ticked, walls between the robot and the flag are
+        knocked out so the board is always solvable.
+        """
+        if self.searching:
+            return
+        self.visited_cells.clear()
+        wall_density = DIFFICULTY_DENSITY.get(self.difficulty.get(), 0.3)
+        connect = (self.start, self.goal) if self.guarantee_path.get() else None
+        maze_gen.generate(self.grid, self.maze_style.get(), wall_density, seed,
+                          keep_free=(self.start, self.goal), connect=connect)
+        if self.random_terrain.get():
+            fill_random_costs(self.grid, seed=seed)
+        else:
+            self.grid.clear_costs()
         self.draw_grid()
 
-    def generate_random_maze(self):
-        """Generate maze based on difficulty"""
-        self.clear_walls()
-        difficulty_map = {"Easy": 0.2, "Medium": 0.3, "Hard": 0.4, "Expert": 0.5}
-        wall_density = difficulty_map.get(self.difficulty.get(), 0.3)
-        
-        for i in range(GRID_SIZE):
-            for j in range(GRID_SIZE):
-                if random.random() < wall_density:
-                    self.grid_map[i][j] = 1
-        
-        if self.start:
-            self.grid_map[self.start[0]][self.start[1]] = 0
-        if self.goal:
-            self.grid_map[self.goal[0]][self.goal[1]] = 0
-        self.draw_grid()
+    def save_map_file(self):
+        """Save the board as a binary map file"""
+        path = filedialog.asksaveasfilename(defaultextension=".rpmap",
+                                            filetypes=[("Robo maps", "*.rpmap")])
+        if path:
+            save_map(self.grid, path)
+
+    def load_map_file(self):
+        """Open a binary map or a Moving AI .map file"""
+        if self.is_busy():
+            return
+        path = filedialog.askopenfilename(filetypes=[("Maps", "*.rpmap *.map"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            grid = load_any(path)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("❌ Error", f"Could not load map:\n{e}")
+            return
+        self.set_grid(grid)
+
+    def set_grid(self, grid):
+        """Swap in a new board, zoomed out so it fits the canvas where it can"""
+        self.grid = grid
+        self.path_cache = PathCache(grid)
+        self.start = None
+        self.goal = None
+        self.visited_cells.clear()
+        self.build_grid(min(CELL_SIZE, BOARD_PIXELS / max(grid.rows, grid.cols)))
 
     def clear_walls(self):
         """Clear all walls"""
-        self.grid_map = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        if self.searching:
+            return
+        self.grid.clear()
         self.visited_cells.clear()
         self.draw_grid()
 
     def find_path(self):
-        if self.is_animating:
+        if self.is_busy():
             return
         if not self.start or not self.goal:
             messagebox.showerror("❌ Error", "Place both robot and flag first!")
             return
 
-        self.visited_cells.clear()
-        algorithm = self.alg_choice.get()
-        
-        if algorithm == "A*":
-            path = self.astar_search(self.start, self.goal)
-        elif algorithm == "Dijkstra":
-            path = self.dijkstra_search(self.start, self.goal)
-        elif algorithm == "BFS":
-            path = self.bfs_search(self.start, self.goal)
-        elif algorithm == "DFS":
-            path = self.dfs_search(self.start, self.goal)
-        else:
-            path = None
+        self.clear_visited()
+        self.clear_path()
+        self.clear_agents()
+        self.run_search(self.alg_choice.get(), self.show_found_path)
 
+    def show_found_path(self, path, stats):
+        self.show_explored(stats)
         if path:
             self.draw_path(path)
             self.calculate_score(path)
             elapsed = int(time.time() - self.start_time) if self.start_time else 0
+            # Cost-blind algorithms find the fewest steps, not the cheapest route
+            blind = self.grid.costs is not None and stats.algorithm not in WEIGHTED_ALGORITHMS
             messagebox.showinfo("🎉 Success!", 
                               f"Path Found!\n\n"
-                              f"📊 Algorithm: {algorithm}\n"
-                              f"📏 Path Length: {len(path)} steps\n"
+                              f"📊 Algorithm: {stats.algorithm}{' (ignores terrain costs)' if blind else ''}\n"
+                              f"📏 Path Length: {len(path)} steps (cost {stats.path_cost})\n"
                               f"⏱️ Time: {elapsed}s\n"
-                              f"🏆 Score: +{self.moves}")
+                              f"🔍 Search: {stats.wall_time * 1000:.2f} ms, {stats.nodes_expanded} expanded,\n"
+                              f"     {stats.pushes} pushes, peak frontier {stats.peak_frontier}\n"
+                              f"🏆 Score: +{self.moves}\n"
+                              f"💾 Cache hits: {self.path_cache.hits}/{self.path_cache.hits + self.path_cache.misses}")
         else:
             messagebox.showwarning("😞 No Path", "Robot can't reach flag!\nTry removing walls.")
 
@@ -319,46 +531,70 @@ class RoboPathFindingApp(tk.Tk):
             messagebox.showerror("❌ Error", "Place both robot and flag first!")
             return
         
-        if self.is_animating:
+        if self.is_busy():
             return
         
-        algorithm = self.alg_choice.get()
-        if algorithm == "A*":
-            path = self.astar_search(self.start, self.goal)
-        elif algorithm == "Dijkstra":
-            path = self.dijkstra_search(self.start, self.goal)
-        elif algorithm == "BFS":
-            path = self.bfs_search(self.start, self.goal)
-        elif algorithm == "DFS":
-            path = self.dfs_search(self.start, self.goal)
-        else:
-            path = None
-        
+        self.run_search(self.alg_choice.get(), self.start_animation)
+
+    def start_animation(self, path, stats):
         if not path:
             messagebox.showwarning("😞 No Path", "No path found!")
             return
         
+        self.clear_path()
+        self.clear_agents()
+        self.clear_visited()
+        self.robot_index = 0
+        self.play(PathAnimation(self, [path], lambda step: self.move_robot(path, step),
+                                lambda: self.finish_robot(path), self.robot_speed.get()))
+
+    def move_robot(self, path, step):
+        """Frame callback: slide the robot sprite and trail the cells it passed"""
+        reached = int(step)
+        if reached > self.robot_index:
+            passed = path[self.robot_index:reached]
+            self.visited_cells.update(passed)
+            self.board.mark_visited(passed)
+            self.start = path[reached]
+            self.draw_cells(passed + [self.start])
+            self.robot_index = reached
+        self.canvas.coords(self.robot_item, *self.cell_center(interpolate(path, step)))
+
+    def finish_robot(self, path):
+        self.stop_animation()
+        self.calculate_score(path)
+        messagebox.showinfo("🎉 Arrived!", f"Robot reached the flag!\n🏆 Score: +{self.moves}")
+
+    def play(self, animation):
+        """Lock the board and run ``animation`` with the playback buttons enabled"""
         self.is_animating = True
+        self.animation = animation
         self.run_button.config(state=tk.DISABLED)
-        self.animate_robot_movement(path, 0)
+        self.pause_button.config(state=tk.NORMAL, text="⏸ PAUSE")
+        self.skip_button.config(state=tk.NORMAL)
+        animation.start()
+
+    def stop_animation(self):
+        if self.animation is not None:
+            self.animation.stop()
+            self.animation = None
+        self.is_animating = False
+        self.run_button.config(state=tk.NORMAL)
+        self.pause_button.config(state=tk.DISABLED, text="⏸ PAUSE")
+        self.skip_button.config(state=tk.DISABLED)
 
-    def animate_robot_movement(self, path, index):
-        """Recursive animation of robot movement"""
-        if index >= len(path):
-            self.is_animating = False
-            self.run_button.config(state=tk.NORMAL)
-            self.calculate_score(path)
-            messagebox.showinfo("🎉 Arrived!", f"Robot reached the flag!\n🏆 Score: +{self.moves}")
-            return
-        
-        # Update robot position
-        old_start = self.start
-        self.start = path[index]
-        self.visited_cells.add(old_start)
-        self.draw_grid()
-        
-        # Continue animation
-        self.after(100, lambda: self.animate_robot_movement(path, index + 1))
+    def on_speed_change(self, value):
+        if self.animation is not None:
+            self.animation.set_speed(float(value))
+
+    def pause_animation(self):
+        if self.animation is not None:
+            self.animation.toggle_pause()
+            self.pause_button.config(text="▶ RESUME" if self.animation.paused else "⏸ PAUSE")
+
+    def skip_animation(self):
+        if self.animation is not None:
+            self.animation.skip()
 
     def calculate_score(self, path):
         """Calculate score based on path length and difficulty"""
@@ -387,6 +623,8 @@ class RoboPathFindingApp(tk.Tk):
 
     def next_level(self):
         """Progress to next level"""
+        if self.searching:
+            return
         self.level += 1
         self.start = None
         self.goal = None
@@ -396,127 +634,226 @@ class RoboPathFindingApp(tk.Tk):
         messagebox.showinfo("🎮 Level Up!", f"Welcome to Level {self.level}!\nMaze difficulty increased!")
 
     def draw_path(self, path):
+        """Draw the path on its own "path" tag layer above the cells.
+
+        Short paths get a dot per cell; long ones are a single line item.
+        """
+        self.clear_path()
+        size = self.board.cell_size
+        if len(path) > PATH_OVAL_LIMIT:
+            points = [xy for cell in path for xy in self.cell_center(cell)]
+            self.canvas.create_line(*points, fill="#00d4ff", width=max(1, size // 3),
+                                    capstyle=tk.ROUND, joinstyle=tk.ROUND, tags=("path", "overlay"))
+        else:
+            for (r, c) in path:
+                if (r, c) != self.start and (r, c) != self.goal:
+                    inset = size * 4 / 15
+                    x1, y1 = c * size + inset, r * size + inset
+                    x2, y2 = x1 + size - 2 * inset, y1 + size - 2 * inset
+                    self.canvas.create_oval(x1, y1, x2, y2, fill="#00d4ff", outline="#0099cc", width=2,
+                                            tags=("path", "overlay"))
+        self.canvas.tag_raise("marker")
+
+    def run_search(self, algorithm, on_done):
+        """Search in a worker thread, then call on_done(path, stats) on the Tk thread.
+
+        Results are cached per grid version, so animating a path that was
+        just found (or asking the same question twice) skips the search.
+        While the search runs, expanded cells are streamed onto the canvas
+        from poll_search and the board is locked against edits.
+        Robot and flag in different regions are answered from the
+        connectivity index, with no search at all; the index is (re)built in
+        the worker too, since relabelling a large map takes a while.
+        """
+        self.begin_search()
+        self.search_drawn = 0
+        self.search_stats = SearchStats(algorithm, cancel=self.cancel_event)
+
+        log = self.search_log if self.log_searches.get() else None
+        start, goal, stats = self.start, self.goal, self.search_stats
+        grid = self.grid
+
+        def work():
+            try:
+                if index_for(grid).connected(start, goal):
+                    self.search_result = self.path_cache.search(start, goal, algorithm, log=log, stats=stats)
+                else:
+                    self.search_result = unreachable_result(algorithm, start, goal)
+            except Exception as e:
+                self.search_error = e
+
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        self.after(SEARCH_POLL_MS, self.poll_search, thread, on_done)
+
+    def poll_search(self, thread, on_done):
+        """Draw the cells expanded since the last poll, or finish the search"""
+        if thread.is_alive():
+            order = self.search_stats.expansion_order
+            batch = order[self.search_drawn:self.search_drawn + SEARCH_DRAW_BATCH]
+            self.search_drawn += len(batch)
+            new_cells = set(batch) - {self.start, self.goal}
+            self.visited_cells |= new_cells
+            self.board.mark_visited(new_cells)
+            self.draw_cells(new_cells)
+            self.after(SEARCH_POLL_MS, self.poll_search, thread, on_done)
+            return
+
+        if not self.end_search():
+            return
+        path, stats = self.search_result
+        if stats.cancelled:
+            self.search_label.config(text=f"SEARCH: cancelled after {stats.nodes_expanded} nodes")
+            return
+        if getattr(stats, "unreachable", False):
+            self.search_label.config(text="SEARCH: skipped, flag is in another region")
+        else:
+            self.search_label.config(text=f"SEARCH: {stats.wall_time * 1000:.1f} ms | {stats.nodes_expanded} nodes")
+        on_done(path, stats)
+
+    def begin_search(self):
+        """Lock the board and buttons while a worker thread searches"""
+        self.searching = True
+        self.search_result = None
+        self.search_error = None
+        self.cancel_event = threading.Event()
+        for button in (self.run_button, self.animate_button, self.multi_button):
+            button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.search_label.config(text="SEARCH: running...")
+
+    def end_search(self):
+        """Unlock after a worker finished; False if it raised"""
+        self.searching = False
+        for button in (self.run_button, self.animate_button, self.multi_button):
+            button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        if self.search_error is not None:
+            self.search_label.config(text="SEARCH: failed")
+            messagebox.showerror("❌ Error", f"Search failed: {self.search_error}")
+            return False
+        return True
+
+    def run_multi_robot(self):
+        """Place N robot/flag pairs and plan collision-free paths for all of them.
+
+        Both the placement and the planning run in a worker thread; the
+        robots are drawn once the plans are in.
+        """
+        if self.is_busy():
+            return
+        count = max(2, min(self.robot_count.get(), MAX_ROBOTS))
+        self.start = None
+        self.goal = None
+        self.clear_visited()
         self.draw_grid()
-        for (r, c) in path:
-            if (r, c) != self.start and (r, c) != self.goal:
-                x1, y1 = c * CELL_SIZE + 8, r * CELL_SIZE + 8
-                x2, y2 = x1 + 14, y1 + 14
-                self.canvas.create_oval(x1, y1, x2, y2, fill="#00d4ff", outline="#0099cc", width=2)
-
-    def get_neighbors(self, state):
-        """Get valid neighbors"""
-        r, c = state
-        neighbors = []
-        for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-            nr, nc = r+dr, c+dc
-            if 0 <= nr < GRID_SIZE and 0 <= nc < GRID_SIZE and self.grid_map[nr][nc] == 0:
-                neighbors.append((nr,nc))
-        return neighbors
-
-    # Pathfinding algorithms (same as before)
-    def astar_search(self, start, goal):
-        def heuristic(s):
-            return abs(s[0] - goal[0]) + abs(s[1] - goal[1])
-
-        open_set = []
-        heapq.heappush(open_set, (0 + heuristic(start), 0, start, None))
-        came_from = {}
-        cost_so_far = {start: 0}
-
-        while open_set:
-            _, g, current, parent = heapq.heappop(open_set)
-            if current == goal:
-                path = [current]
-                while parent:
-                    path.append(parent)
-                    parent = came_from.get(parent)
-                return path[::-1]
-            if current in came_from:
-                continue
-            came_from[current] = parent
-            for neighbor in self.get_neighbors(current):
-                new_cost = g + 1
-                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
-                    cost_so_far[neighbor] = new_cost
-                    priority = new_cost + heuristic(neighbor)
-                    heapq.heappush(open_set, (priority, new_cost, neighbor, current))
-        return None
-
-    def dijkstra_search(self, start, goal):
-        queue = [(0, start, None)]
-        distances = {start: 0}
-        came_from = {}
-
-        while queue:
-            dist, current, parent = heapq.heappop(queue)
-            if current == goal:
-                path = [current]
-                while parent:
-                    path.append(parent)
-                    parent = came_from.get(parent)
-                return path[::-1]
-            if current in came_from:
-                continue
-            came_from[current] = parent
-            for neighbor in self.get_neighbors(current):
-                new_dist = dist + 1
-                if neighbor not in distances or new_dist < distances[neighbor]:
-                    distances[neighbor] = new_dist
-                    heapq.heappush(queue, (new_dist, neighbor, current))
-        return None
-
-    def bfs_search(self, start, goal):
-        from collections import deque
-        queue = deque([(start, None)])
-        came_from = {start: None}
-
-        while queue:
-            current, parent = queue.popleft()
-            if current == goal:
-                path = [current]
-                while came_from[current]:
-                    current = came_from[current]
-                    path.append(current)
-                return path[::-1]
-            for neighbor in self.get_neighbors(current):
-                if neighbor not in came_from:
-                    came_from[neighbor] = current
-                    queue.append((neighbor, current))
-        return None
-
-    def dfs_search(self, start, goal):
-        stack = [(start, None)]
-        came_from = {}
-        visited = set()
-
-        while stack:
-            current, parent = stack.pop()
-            if current in visited:
-                continue
-            visited.add(current)
-            came_from[current] = parent
-            if current == goal:
-                path = [current]
-                while came_from[current]:
-                    current = came_from[current]
-                    path.append(current)
-                return path[::-1]
-            for neighbor in self.get_neighbors(current):
-                if neighbor not in visited:
-                    stack.append((neighbor, current))
-        return None
+
+        self.begin_search()
+        cancel = self.cancel_event
+        grid = self.grid
+
+        def work():
+            # Picking the pairs reads the connectivity index, which may have
+            # to relabel a large map first; keep that off the Tk thread too
+            try:
+                agents = random_agents(grid, count)
+                self.search_result = agents, plan_agents(grid, agents, cancel=cancel) if agents else []
+            except Exception as e:
+                self.search_error = e
+
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        self.after(SEARCH_POLL_MS, self.poll_agents, thread)
+
+    def poll_agents(self, thread):
+        if thread.is_alive():
+            self.after(SEARCH_POLL_MS, self.poll_agents, thread)
+            return
+        if not self.end_search():
+            return
+        agents, results = self.search_result
+        if not agents:
+            self.search_label.config(text="SEARCH: no room for robots")
+            messagebox.showwarning("😞 No Room", "No free cells left for robots!")
+            return
+        self.draw_agents(agents)
+        info = summary(results)
+        if any(stats.cancelled for _, stats in results):
+            self.search_label.config(text=f"SEARCH: cancelled after {len(results)} robots")
+            return
+        self.search_label.config(
+            text=f"SEARCH: {info['planned']}/{info['agents']} robots | "
+                 f"{info['mean_time_per_agent'] * 1000:.1f} ms/robot")
+        paths = [path for path, _ in results]
+        if not any(paths):
+            messagebox.showwarning("😞 No Path", "No robot could reach its flag!")
+            return
+        self.play(PathAnimation(self, paths, lambda step: self.move_agents(paths, step),
+                                lambda: self.finish_agents(info), self.robot_speed.get()))
+
+    def draw_agents(self, agents):
+        """Draw a robot and a flag for every pair on the "agent" tag layer"""
+        self.clear_agents()
+        self.agent_items = []
+        for start, goal in agents:
+            self.canvas.create_text(*self.cell_center(goal), text="🏁", font=("Arial", 12),
+                                    tags=("agent", "overlay"))
+            robot = self.create_marker(self.robot_image, "🤖")
+            self.canvas.itemconfig(robot, state=tk.NORMAL, tags=("agent", "overlay"))
+            self.canvas.coords(robot, *self.cell_center(start))
+            self.agent_items.append(robot)
+        self.canvas.tag_raise("agent")
+
+    def move_agents(self, paths, step):
+        """Frame callback: every robot is ``step`` time steps along its path"""
+        for item, path in zip(self.agent_items, paths):
+            if path:
+                self.canvas.coords(item, *self.cell_center(interpolate(path, step)))
+
+    def finish_agents(self, info):
+        self.stop_animation()
+        messagebox.showinfo("🎉 Arrived!",
+                            f"{info['planned']} of {info['agents']} robots reached their flags!\n\n"
+                            f"⏱️ Planning: {info['total_time'] * 1000:.1f} ms total, "
+                            f"{info['mean_time_per_agent'] * 1000:.2f} ms per robot "
+                            f"(max {info['max_time_per_agent'] * 1000:.2f} ms)\n"
+                            f"📏 Makespan: {info['makespan']} steps")
+
+    def clear_agents(self):
+        self.canvas.delete("agent")
+        self.agent_items = []
+
+    def cell_center(self, cell):
+        return self.board.cell_center(cell)
+
+    def cancel_search(self):
+        if self.searching:
+            self.cancel_event.set()
+
+    def is_busy(self):
+        """True while the robot is animating or a search is still in flight"""
+        return self.is_animating or self.searching
+
+    def show_explored(self, stats):
+        """Highlight the cells the search expanded"""
+        self.visited_cells = set(stats.expansion_order) - {self.start, self.goal}
+        self.board.mark_visited(self.visited_cells)
+        self.draw_cells(self.visited_cells)
 
     def reset_game(self):
         """Complete game reset"""
+        if self.searching:
+            return
         self.start = None
         self.goal = None
-        self.grid_map = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.grid.clear()
+        self.grid.clear_costs()
         self.score = 0
         self.level = 1
         self.moves = 0
         self.start_time = None
         self.visited_cells.clear()
-        self.is_animating = False
+        self.stop_animation()
         self.update_stats()
         self.draw_grid()
 
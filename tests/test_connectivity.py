@@ -0,0 +1,80 @@
+import gc
+import random
+import weakref
+
+from connectivity import ConnectivityIndex, index_for
+from pathfinding_engine import Grid, fill_random_walls
+
+
+def partition(grid, index):
+    """Free cells grouped by region, independent of the label numbers"""
+    regions = {}
+    for r in range(grid.rows):
+        for c in range(grid.cols):
+            label = index.component((r, c))
+            if label is not None:
+                regions.setdefault(label, set()).add((r, c))
+    return sorted(sorted(cells) for cells in regions.values())
+
+
+def test_wall_line_splits_a_region():
+    grid = Grid(5)
+    index = index_for(grid)
+    assert index.component_count() == 1
+    for r in range(5):
+        grid.set_wall((r, 2))
+    assert index.component_count() == 2
+    assert not index.connected((0, 0), (0, 4))
+    assert index.connected((0, 0), (4, 1))
+    assert index.component((3, 2)) is None
+
+
+def test_opening_a_wall_merges_regions():
+    grid = Grid(5)
+    for r in range(5):
+        grid.set_wall((r, 2))
+    index = index_for(grid)
+    assert index.component_count() == 2
+    grid.set_wall((2, 2), False)
+    assert index.component_count() == 1
+    assert index.connected((0, 0), (4, 4))
+
+
+def test_wall_and_opening_in_one_sync():
+    # The new wall cuts the region; the opened cell joins a walled-off pocket
+    grid = Grid.from_rows([[0, 0, 0, 0],
+                           [0, 1, 1, 1],
+                           [0, 1, 0, 1],
+                           [0, 1, 1, 1]])
+    index = index_for(grid)
+    assert not index.connected((0, 0), (2, 2))
+    grid.set_wall((0, 1))
+    grid.set_wall((1, 2), False)
+    assert index.connected((0, 2), (2, 2))
+    assert not index.connected((0, 0), (2, 2))
+    assert index.component_count() == 2
+
+
+def test_incremental_labels_match_a_rebuild():
+    rng = random.Random(0)
+    for seed in range(30):
+        size = rng.randint(3, 25)
+        grid = fill_random_walls(Grid(size), 0.35, seed)
+        index = index_for(grid)
+        for _ in range(20):
+            for _ in range(rng.randint(1, 6)):
+                grid.toggle_wall((rng.randrange(size), rng.randrange(size)))
+            assert partition(grid, index) == partition(grid, ConnectivityIndex(grid)), seed
+
+
+def test_index_is_synced_and_goes_away_with_its_grid():
+    grid = Grid(4)
+    index = index_for(grid)
+    grid.set_wall((0, 1))
+    grid.set_wall((1, 0))
+    assert index_for(grid) is index
+    assert index.labels[0] != index.labels[5]
+    ref = weakref.ref(grid)
+    del grid, index
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,25 @@
+import random
+
+import hpa  # noqa: F401 - registers "HPA*"
+from pathfinding_engine import Grid, fill_random_walls, search
+
+
+def test_start_on_cluster_border():
+    # (0, 15) is the last column of the first cluster, so it is a transition node
+    grid = Grid(1, 20)
+    path, _ = search(grid, (0, 15), (0, 18), "HPA*")
+    assert path == [(0, 15), (0, 16), (0, 17), (0, 18)]
+
+
+def test_finds_a_path_whenever_bfs_does():
+    rng = random.Random(0)
+    for seed in range(40):
+        size = rng.randint(5, 40)
+        grid = fill_random_walls(Grid(size), 0.3, seed)
+        for _ in range(20):
+            start = (rng.randrange(size), rng.randrange(size))
+            goal = (rng.randrange(size), rng.randrange(size))
+            expected, _ = search(grid, start, goal, "BFS")
+            path, _ = search(grid, start, goal, "HPA*")
+            assert (path is None) == (expected is None), (seed, start, goal)
+            grid.toggle_wall((rng.randrange(size), rng.randrange(size)))
@@ -0,0 +1,27 @@
+import random
+
+from connectivity import index_for
+from multi_agent import check_collisions, plan_agents, random_agents
+from pathfinding_engine import Grid, fill_random_walls
+
+
+def test_random_agents_after_wall_edits():
+    # The index exists before the walls go up, so it has edits to catch up on
+    grid = Grid(5)
+    index = index_for(grid)
+    assert index.connected((0, 0), (0, 4))
+    for r in range(5):
+        grid.set_wall((r, 2))
+    agents = random_agents(grid, 10, seed=1)
+    assert agents
+    for start, goal in agents:
+        assert (start[1] < 2) == (goal[1] < 2), (start, goal)
+
+
+def test_plans_never_cross_robots_left_without_one():
+    rng = random.Random(0)
+    for seed in range(30):
+        grid = fill_random_walls(Grid(rng.randint(5, 25)), 0.3, seed)
+        agents = random_agents(grid, rng.randint(2, 30), seed)
+        paths = [path for path, _ in plan_agents(grid, agents)]
+        assert check_collisions(paths, agents) == [], seed